@@ -0,0 +1,49 @@
+""" Solving from asyncio without blocking the event loop.\n
+By default the search runs on the loop a few nodes at a time, giving other tasks a turn in between.
+An executor can be given to run the whole solve there instead """
+import asyncio
+import os
+from concurrent.futures import Executor
+from contextlib import nullcontext
+from time import perf_counter_ns
+from batch import SolveResult, Solver, totext
+from main import Sudoku
+from search import NODES, Search
+
+
+class Limiter(asyncio.Semaphore):
+    """ At most limit solves at once, the rest wait their turn in the order they arrived """
+
+    def __init__(self, limit: int | None = None):
+        self.limit = limit or os.cpu_count() or 1
+        super().__init__(self.limit)
+
+
+def _solve(startpos: str | bytes, name: str, deduce: bool) -> SolveResult:
+    return Solver(deduce).solve(startpos, 0, name)
+
+
+async def _cooperative(startpos: str | bytes, name: str, deduce: bool, nodes: int) -> SolveResult:
+    start = perf_counter_ns()
+    search = Search(Sudoku(startpos, name), deduce)
+    while (solved := search.run(nodes)) is None:
+        await asyncio.sleep(0)
+    return SolveResult(0, totext(startpos), search.s.tokenize() if solved else None, *search.stats.counts,
+                       perf_counter_ns() - start, name)
+
+
+async def solve_async(startpos: str | bytes, name: str = '', *, deduce: bool = True, nodes: int = NODES,
+                      timeout: float | None = None, executor: Executor | None = None,
+                      limiter: asyncio.Semaphore | None = None) -> SolveResult:
+    """ Solves a puzzle, returning its SolveResult.\n
+    Without an executor the search gives other tasks a turn every nodes guesses or backtracks, and stops
+    at the next turn when it times out or is cancelled. elapsed then includes the time other tasks had.\n
+    With an executor the solve runs there. A timeout or cancel stops the wait, but a solve that has
+    already started carries on in the executor until it finishes.\n
+    limiter, such as a Limiter, is held for the whole solve. A timeout raises TimeoutError """
+    async with limiter or nullcontext():
+        if executor is None:
+            work = _cooperative(startpos, name, deduce, nodes)
+        else:
+            work = asyncio.get_running_loop().run_in_executor(executor, _solve, startpos, name, deduce)
+        return await asyncio.wait_for(work, timeout)
@@ -0,0 +1,87 @@
+""" Solving lots of puzzles as a library.\n
+Nothing is printed and each puzzle gets its own counts """
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Iterable, Iterator, NamedTuple
+from grid import Grid
+from main import Sudoku, run_dlx
+from search import Search
+
+
+class Puzzle(NamedTuple):
+    startpos: str | bytes | Grid
+    name: str = ''
+
+
+def topuzzle(item: 'str | bytes | Grid | tuple') -> Puzzle:
+    """ Puzzle from a start position as str, bytes or Grid, or a (start position, name) pair.\n
+    The start position is kept as it is, Grid.parse and Grid.load read each of them directly """
+    startpos, name = (item, '') if isinstance(item, (str, bytes, Grid)) else item
+    return Puzzle(startpos, name)
+
+
+def totext(startpos: str | bytes | Grid) -> str:
+    """ A start position as the str kept in a SolveResult """
+    if isinstance(startpos, Grid):
+        return startpos.tokenize()
+    if isinstance(startpos, bytes):
+        return startpos.decode('ascii', 'replace')
+    return startpos
+
+
+@dataclass
+class SolveResult:
+    index: int  # Position in the input
+    startpos: str
+    solution: str | None  # None when there is no solution
+    thinks: int = 0
+    deductions: int = 0
+    guesses: int = 0
+    fails: int = 0
+    maxlevel: int = 0
+    elapsed: int = 0  # ns
+    name: str = ''
+
+    @property
+    def solved(self) -> bool:
+        return self.solution is not None
+
+    @property
+    def seconds(self) -> float:
+        return self.elapsed / 1e9
+
+
+def _search(s: Sudoku, deduce: bool):
+    search = Search(s, deduce)
+    return search.run(), search.stats
+
+
+# How to solve a Sudoku in place. Return (solved, SolveStats)
+BACKENDS = {'search': _search, 'dlx': run_dlx}
+
+
+class Solver:
+    """ Solves one puzzle at a time, reusing the same Sudoku so nothing is rebuilt per puzzle.\n
+    backend is 'search' (propagate and guess) or 'dlx' (Dancing Links) """
+
+    def __init__(self, deduce: bool = True, backend: str = 'search'):
+        self.deduce = deduce
+        self.method = BACKENDS[backend]
+        self.s = Sudoku('')
+
+    def solve(self, startpos: str | bytes | Grid, index: int = 0, name: str = '') -> SolveResult:
+        s = self.s
+        start = perf_counter_ns()
+        s.reset(startpos, name)
+        solved, stats = self.method(s, self.deduce)
+        elapsed = perf_counter_ns() - start
+        return SolveResult(index, totext(startpos), s.tokenize() if solved else None, *stats.counts, elapsed, name)
+
+
+def solve_many(puzzles: Iterable[str | bytes | Grid | tuple], deduce: bool = True, backend: str = 'search') -> Iterator[SolveResult]:
+    """ Solves each start position in turn, yielding a SolveResult as each one is done.\n
+    Each puzzle is a start position or a (start position, name) pair such as a Puzzle """
+    solver = Solver(deduce, backend)
+    for index, item in enumerate(puzzles):
+        startpos, name = topuzzle(item)
+        yield solver.solve(startpos, index, name)
@@ -0,0 +1,119 @@
+""" Benchmark of the reference puzzles.\n
+Each puzzle is solved repeat times and the fastest, median and 95th percentile times kept with its counts.
+Results can be saved as a JSON baseline and later runs compared with it. A run fails if the total of the
+fastest times is slower, or a puzzle searches more, than the threshold allows, or a puzzle is no longer solved.
+A single puzzle of a few ms that is slower is a warning. --ignore-time makes the total a warning too, for a
+busy machine """
+import json
+import math
+import platform
+import statistics
+import sys
+from typing import Iterable
+from batch import Solver, topuzzle
+from puzzles import REFERENCE
+
+
+def percentile(times: list[int], p: float) -> int:
+    """ Nearest rank percentile, p from 0 to 100 """
+    ordered = sorted(times)
+    return ordered[max(0, math.ceil(p/100 * len(ordered)) - 1)]
+
+
+def run(puzzles: Iterable = REFERENCE, repeat: int = 20, deduce: bool = True, backend: str = 'search') -> dict:
+    """ Solves each puzzle repeat times after one untimed warm up solve.\n
+    The timed solves go round the whole list repeat times, so a slow spell on the machine is spread over
+    every puzzle instead of landing on one.\n
+    Returns a dict ready for json with a summary and, by name, the times in ns and counts of each puzzle """
+    solver = Solver(deduce, backend)
+    puzzles = list(map(topuzzle, puzzles))
+    first = list(solver.solve(startpos, index, name) for index, (startpos, name) in enumerate(puzzles))
+    times = list([] for _ in puzzles)
+    for _ in range(repeat):
+        for index, (startpos, name) in enumerate(puzzles):
+            times[index].append(solver.solve(startpos, index, name).elapsed)
+    results = {}
+    for index, ((startpos, name), result, times) in enumerate(zip(puzzles, first, times)):
+        results[name or str(index)] = {
+            'min': min(times), 'median': int(statistics.median(times)), 'p95': percentile(times, 95),
+            'solved': result.solved,
+            'thinks': result.thinks, 'deductions': result.deductions, 'guesses': result.guesses,
+            'fails': result.fails, 'maxlevel': result.maxlevel}
+    total = sum(_['min'] for _ in results.values())
+    median = sum(_['median'] for _ in results.values())
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'backend': backend,
+            'deduce': deduce, 'repeat': repeat, 'total': total,
+            'per_second': len(results) / (median/1e9) if median else 0.0, 'puzzles': results}
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.25,
+            time: bool = True) -> tuple[list[str], list[str]]:
+    """ (regressions, warnings) as messages compared with the baseline, threshold 0.25 meaning 25%.\n
+    Regressions are the total of the fastest times and search counts over the threshold and puzzles no longer
+    solved. Warnings are the fastest time of a puzzle over the threshold, and the total too with time=False.\n
+    Raises ValueError if the baseline was run with a different backend or deduce, as nothing would match """
+    for setting in ('backend', 'deduce'):
+        if current[setting] != baseline[setting]:
+            raise ValueError(f"The baseline has {setting} {baseline[setting]} but this run has {current[setting]}")
+    regressions, warnings = [], []
+    if current['python'] != baseline['python']:
+        warnings.append(f"baseline ran on Python {baseline['python']}, this is {current['python']}")
+    total = 0
+    for name, now in current['puzzles'].items():
+        if (then := baseline['puzzles'].get(name)) is None:
+            continue
+        total += then['min']
+        if now['min'] > then['min'] * (1+threshold):
+            warnings.append(f"{name}: fastest {then['min']/1e6:.2f}ms -> {now['min']/1e6:.2f}ms "
+                          f"({now['min']/then['min']-1:+.0%})")
+        for count in ('thinks', 'deductions', 'guesses', 'fails', 'maxlevel'):
+            if now[count] > then[count] * (1+threshold):
+                regressions.append(f"{name}: {count} {then[count]} -> {now[count]}")
+        if then['solved'] and not now['solved']:
+            regressions.append(f"{name}: no longer solved")
+    now = sum(r['min'] for name, r in current['puzzles'].items() if name in baseline['puzzles'])
+    if total and now > total * (1+threshold):
+        (regressions if time else warnings).append(f"total of fastest times {total/1e6:.2f}ms -> {now/1e6:.2f}ms ({now/total-1:+.0%})")
+    return regressions, warnings
+
+
+def report(current: dict) -> None:
+    """ Print a line per puzzle and the summary """
+    print(f"{'Puzzle':24} {'fastest':>10} {'median':>10} {'p95':>10} {'thinks':>7} {'deduct':>7} {'guess':>6} {'fails':>6} {'level':>5}")
+    for name, r in current['puzzles'].items():
+        print(f"{name:24} {r['min']/1e6:8.2f}ms {r['median']/1e6:8.2f}ms {r['p95']/1e6:8.2f}ms {r['thinks']:7} {r['deductions']:7} "
+              f"{r['guesses']:6} {r['fails']:6} {r['maxlevel']:5}{'' if r['solved'] else ' UNSOLVED'}")
+    print(f"Total of fastest {current['total']/1e6:.2f}ms, {current['per_second']:.1f} puzzles/s at the median, "
+          f"{current['backend']} on Python {current['python']}")
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Time the reference puzzles and compare with a baseline")
+    parser.add_argument('--repeat', type=int, default=20, help="Timed solves of each puzzle")
+    parser.add_argument('--backend', choices=('search', 'dlx'), default='search')
+    parser.add_argument('--no-deduce', dest='deduce', action='store_false')
+    parser.add_argument('--baseline', help="JSON from an earlier --save to compare with")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed increase, 0.25 is 25%%")
+    parser.add_argument('--ignore-time', dest='time', action='store_false',
+                        help="Only warn about a slower total, still failing on counts")
+    parser.add_argument('--save', help="Write the results as JSON to use as a baseline")
+    args = parser.parse_args()
+    current = run(REFERENCE, args.repeat, args.deduce, args.backend)
+    report(current)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=1)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        try:
+            regressions, warnings = compare(current, baseline, args.threshold, args.time)
+        except ValueError as e:
+            sys.exit(f"Can't compare with {args.baseline}: {e}")
+        for line in warnings:
+            print(f"WARNING {line}")
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
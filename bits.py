@@ -0,0 +1,22 @@
+""" Bitmask helpers for sets of candidate values.\n
+Value v (1-9) is held as bit v-1 so all 9 values fit in a 9 bit int (0x1FF).\n
+BIT[0] is 0 so an empty point adds nothing when masks are or'ed together """
+
+ALL: int = 0x1FF
+
+# BIT[v] is the mask for a single value
+BIT: tuple[int, ...] = tuple(0 if v == 0 else 1 << (v-1) for v in range(10))
+
+# Lookup tables indexed by mask, cheaper than counting bits every time
+POPCOUNT: bytes = bytes(bin(m).count('1') for m in range(ALL+1))
+LOWEST: bytes = bytes((m & -m).bit_length() for m in range(ALL+1))
+DIGITS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(v for v in range(1, 10) if m & BIT[v]) for m in range(ALL+1))
+
+
+def tomask(values) -> int:
+    """ Mask of an iterable of values """
+    ans = 0
+    for v in values:
+        ans |= BIT[v]
+    return ans
@@ -0,0 +1 @@
+""" Puts this directory on sys.path so the tests in tests/ can import the modules here """
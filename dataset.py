@@ -0,0 +1,82 @@
+""" Reading puzzles from large text files without loading them into memory.\n
+One puzzle per line, the 81 characters of the start position in reading order, optionally followed by
+a name or any other columns after a space, tab, comma or semicolon.\n
+Blank lines and lines starting with # are skipped """
+import mmap
+import os
+from array import array
+from typing import Iterator
+from batch import Puzzle
+
+_SEPARATORS = b' \t,;\r'
+
+
+class PuzzleFile:
+    """ A memory mapped puzzle file. Iterate for each Puzzle in turn or index it for random access.\n
+    Start positions are the bytes from the file, with no str made from them.\n
+    The offsets of the lines are only found the first time len() or [] is used """
+
+    def __init__(self, path: str, names: bool = True):
+        self.path = path
+        self.names = names  # False ignores anything after the start position
+        self._file = open(path, 'rb')
+        if os.fstat(self._file.fileno()).st_size:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._data = b''  # Can't map an empty file
+        self._offsets: array | None = None
+
+    def _lines(self) -> Iterator[tuple[int, int]]:
+        """ (start, end) of each line with a puzzle """
+        data = self._data
+        size = len(data)
+        pos = 0
+        while pos < size:
+            if (end := data.find(b'\n', pos)) < 0:
+                end = size
+            if end > pos and data[pos] not in b'#\r':
+                yield pos, end
+            pos = end + 1
+
+    def _puzzle(self, start: int, end: int) -> Puzzle:
+        data = self._data
+        if not self.names or end - start <= 81:
+            return Puzzle(data[start:min(end, start+81)].rstrip(b'\r'))
+        return Puzzle(data[start:start+81], data[start+81:end].strip(_SEPARATORS).decode('utf-8', 'replace'))
+
+    def __iter__(self) -> Iterator[Puzzle]:
+        for start, end in self._lines():
+            yield self._puzzle(start, end)
+
+    @property
+    def offsets(self) -> array:
+        """ Start of each puzzle's line """
+        if self._offsets is None:
+            self._offsets = array('Q', (start for start, _ in self._lines()))
+        return self._offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> Puzzle:
+        start = self.offsets[index]
+        if (end := self._data.find(b'\n', start)) < 0:
+            end = len(self._data)
+        return self._puzzle(start, end)
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> 'PuzzleFile':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_puzzles(path: str, names: bool = True) -> Iterator[Puzzle]:
+    """ Each Puzzle in a file, closing it at the end """
+    with PuzzleFile(path, names) as puzzles:
+        yield from puzzles
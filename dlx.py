@@ -0,0 +1,171 @@
+""" Dancing Links (Knuth's Algorithm X) solver.\n
+A Sudoku is an exact cover problem with 324 columns, 1 per constraint\n
+    each point has a value, each row/column/3x3 has each value once\n
+and 729 rows, 1 per value in a point. Each row covers 4 columns """
+from time import perf_counter_ns
+from geometry import ROW, COL, BOX
+from search import GUESSES
+from stats import SolveStats
+
+# Column headers are 1-324 with 0 as the root
+_POINT, _ROW, _COL, _BOX = 1, 82, 163, 244
+_COLUMNS = 324
+
+
+def _columns(r: int) -> tuple[int, int, int, int]:
+    """ The 4 columns covered by value r%9+1 in point r//9 """
+    i, v = divmod(r, 9)
+    return (_POINT+i, _ROW+ROW[i]*9+v, _COL+COL[i]*9+v, _BOX+BOX[i]*9+v)
+
+
+def _build() -> tuple[list[int], ...]:
+    """ The full set of links, built once and copied for each puzzle """
+    L = list(range(-1, _COLUMNS))
+    R = list(range(1, _COLUMNS+2))
+    L[0], R[_COLUMNS] = _COLUMNS, 0
+    U = list(range(_COLUMNS+1))
+    D = list(range(_COLUMNS+1))
+    C = list(range(_COLUMNS+1))
+    S = [0] * (_COLUMNS+1)
+    rowof = [-1] * (_COLUMNS+1)
+    for r in range(729):
+        first = len(L)
+        for k, c in enumerate(_columns(r)):
+            n = first+k
+            # Add to the bottom of column c
+            U.append(U[c])
+            D.append(c)
+            D[U[c]] = n
+            U[c] = n
+            L.append(first + (k-1) % 4)
+            R.append(first + (k+1) % 4)
+            C.append(c)
+            rowof.append(r)
+            S[c] += 1
+    return L, R, U, D, C, S, rowof
+
+
+_LINKS = _build()
+
+
+class DancingLinks:
+    """ Solves a position given as a bytes like of 81 values (0 for unknown).\n
+    Choosing a column with 1 row is a think if it is a point's column, otherwise a deduction.\n
+    Choosing a column with more rows is a guess for each row tried, and a fail for each that doesn't work.\n
+    The counts and time taken go in stats """
+    __slots__ = ('L', 'R', 'U', 'D', 'C', 'S', 'rowof', 'values', 'stats')
+
+    def __init__(self, values: bytes):
+        self.L, self.R, self.U, self.D, self.C, self.S, self.rowof = (list(_) for _ in _LINKS)
+        self.values = bytes(values)
+        self.stats = SolveStats()
+
+    def _cover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        L[R[c]] = L[c]
+        R[L[c]] = R[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        L[R[c]] = c
+        R[L[c]] = c
+
+    def solve(self) -> list[tuple[int, int, str]] | None:
+        """ List of (index, value, source) for each point without a value, None if there is no solution """
+        start = perf_counter_ns()
+        try:
+            return self._solve()
+        finally:
+            self.stats.elapsed += perf_counter_ns() - start
+
+    def _solve(self) -> list[tuple[int, int, str]] | None:
+        covered = set()
+        for i, v in enumerate(self.values):
+            if v:
+                columns = _columns(i*9 + v-1)
+                if covered.intersection(columns):
+                    # The start position breaks the rules
+                    return None
+                covered.update(columns)
+                for c in columns:
+                    self._cover(c)
+        solution = []
+        return solution if self._search(solution, 0) else None
+
+    def _search(self, solution: list, level: int) -> bool:
+        R, D, S, rowof, stats = self.R, self.D, self.S, self.rowof, self.stats
+        if R[0] == 0:
+            return True  # Everything is covered
+        # Column with fewest rows
+        best, c = 0, R[0]
+        size = 730
+        while c:
+            if S[c] < size:
+                best, size = c, S[c]
+                if size < 2:
+                    break
+            c = R[c]
+        if size == 0:
+            return False
+        if size > 1:
+            level += 1
+            stats.maxlevel = max(stats.maxlevel, level)
+
+        self._cover(best)
+        r = D[best]
+        tries = 0
+        while r != best:
+            if size > 1:
+                source = GUESSES[tries]
+                stats.guesses += 1
+            elif best < _ROW:
+                source = '='
+                stats.thinks += 1
+            else:
+                source = '*'
+                stats.deductions += 1
+            solution.append((rowof[r] // 9, rowof[r] % 9 + 1, source))
+            self._rowcover(r)
+            if self._search(solution, level):
+                return True
+            self._rowuncover(r)
+            solution.pop()
+            if size > 1:
+                stats.fails += 1
+            tries += 1
+            r = D[r]
+        self._uncover(best)
+        return False
+
+    def _rowcover(self, r: int) -> None:
+        """ Cover the other columns of the row of node r """
+        R, C = self.R, self.C
+        j = R[r]
+        while j != r:
+            self._cover(C[j])
+            j = R[j]
+
+    def _rowuncover(self, r: int) -> None:
+        L, C = self.L, self.C
+        j = L[r]
+        while j != r:
+            self._uncover(C[j])
+            j = L[j]
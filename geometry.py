@@ -0,0 +1,48 @@
+""" Fixed geometry of the 9x9 grid, built once at import.\n
+Cells are numbered 0-80 in reading order.\n
+Units are numbered 0-26: rows 0-8, columns 9-17 then 3x3s 18-26 """
+
+ROW: tuple[int, ...] = tuple(_ // 9 for _ in range(81))
+COL: tuple[int, ...] = tuple(_ % 9 for _ in range(81))
+BOX: tuple[int, ...] = tuple(3*(ROW[_]//3) + COL[_]//3 for _ in range(81))
+
+# Cells in each row, column and 3x3
+ROWS: tuple[tuple[int, ...], ...] = tuple(tuple(_ for _ in range(81) if ROW[_] == r) for r in range(9))
+COLS: tuple[tuple[int, ...], ...] = tuple(tuple(_ for _ in range(81) if COL[_] == c) for c in range(9))
+BOXES: tuple[tuple[int, ...], ...] = tuple(tuple(_ for _ in range(81) if BOX[_] == b) for b in range(9))
+UNITS: tuple[tuple[int, ...], ...] = ROWS + COLS + BOXES
+
+# The 3 units each cell belongs to
+CELL_UNITS: tuple[tuple[int, int, int], ...] = tuple((ROW[_], 9+COL[_], 18+BOX[_]) for _ in range(81))
+
+# The 20 other cells that share a unit with each cell
+PEERS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(sorted(set(ROWS[ROW[_]] + COLS[COL[_]] + BOXES[BOX[_]]) - {_})) for _ in range(81))
+
+
+class Cell:
+    """ Where a cell sits on the grid.\n
+    There is one per position, shared by every state, so it can't be changed """
+    __slots__ = ('index', 'row', 'col', 'box', 'units', 'peers')
+
+    def __init__(self, index: int):
+        for name, value in (('index', index), ('row', ROW[index]), ('col', COL[index]), ('box', BOX[index]),
+                            ('units', CELL_UNITS[index]), ('peers', PEERS[index])):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        # Unpickle or copy back to the shared instance
+        return (_cell, (self.index,))
+
+    def __repr__(self) -> str:
+        return f"Cell({self.index}, row={self.row}, col={self.col}, box={self.box})"
+
+
+def _cell(index: int) -> Cell:
+    return CELLS[index]
+
+
+CELLS: tuple[Cell, ...] = tuple(Cell(_) for _ in range(81))
@@ -0,0 +1,72 @@
+""" Compact state of a grid held in flat buffers rather than 81 objects """
+from array import array
+
+# '1'-'9' become 1-9, anything else is empty
+_DECODE: bytes = bytes(c - 48 if 49 <= c <= 57 else 0 for c in range(256))
+_ENCODE: bytes = b'.123456789' + bytes(246)
+_NOMASKS: bytes = bytes(81*2)
+
+
+def _decode(startpos: str | bytes) -> bytes:
+    if isinstance(startpos, str):
+        startpos = startpos.encode('ascii', 'replace')
+    return bytes(startpos[:81]).ljust(81).translate(_DECODE)
+
+
+class Grid:
+    """ Values in a bytearray(81), masks of available and failed values in array('H') of 81.\n
+    source holds the character showing where each value came from.\n
+    Copying is a copy of each buffer, there are no per point objects """
+    __slots__ = ('values', 'available', 'failed', 'source')
+
+    def __init__(self, values: bytes = bytes(81)):
+        self.values = bytearray(values)
+        self.available = array('H', _NOMASKS)
+        self.failed = array('H', _NOMASKS)
+        self.source = bytearray(b' ' * 81)
+
+    @classmethod
+    def parse(cls, startpos: str | bytes) -> 'Grid':
+        """ Grid from a position in reading order with anything other than 1-9 as unknown """
+        return cls(_decode(startpos))
+
+    def load(self, startpos: 'str | bytes | Grid') -> None:
+        """ Replace the state with a new start position, reusing the buffers.\n
+        A Grid's values are copied straight across """
+        self.values[:] = startpos.values if isinstance(startpos, Grid) else _decode(startpos)
+        self.available[:] = self.failed[:] = array('H', _NOMASKS)
+        self.source[:] = b' ' * 81
+
+    def copy(self) -> 'Grid':
+        """ Independent copy of the state """
+        new = Grid.__new__(Grid)
+        new.values = self.values[:]
+        new.available = self.available[:]
+        new.failed = self.failed[:]
+        new.source = self.source[:]
+        return new
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> 'Grid':
+        return self.copy()
+
+    def dumps(self) -> bytes:
+        """ The values and failed masks as bytes, everything else can be worked out from them """
+        return bytes(self.values) + self.failed.tobytes()
+
+    @classmethod
+    def loads(cls, data: bytes) -> 'Grid':
+        """ Grid from dumps """
+        grid = cls(data[:81])
+        grid.failed = array('H', data[81:243])
+        return grid
+
+    def tokenize(self, source: bool = False) -> str:
+        """ Returns the state as a single string """
+        if source:
+            return self.source.decode('ascii')
+        return self.values.translate(_ENCODE).decode('ascii')
+
+    def __repr__(self) -> str:
+        return f"Grid('{self.tokenize()}')"
@@ -1,31 +1,91 @@
 from dataclasses import dataclass, field
-from copy import deepcopy
-from time import perf_counter
 from collections import Counter
-from typing import ClassVar
+from time import perf_counter_ns
+from bits import ALL, BIT, POPCOUNT, LOWEST, DIGITS
+from geometry import ROWS, COLS, BOXES, UNITS, PEERS, CELL_UNITS, CELLS, Cell
+from grid import Grid
+from dlx import DancingLinks
+from search import Search
+from stats import PHASES, SolveStats
+from observe import Observer
 
+# Methods that observe and profile may wrap
+_HOOKED = frozenset(('place', 'fail', 'propagate', *(name for names in PHASES.values() for name in names)))
 
-starttime = 0
 
-
-@dataclass
 class Point:
-    row: int
-    col: int
-    value: int = 0
-    failed: set = field(default_factory=set[int])
-    _available: set = field(default_factory=set[int])
-    source: str = ' '
+    """ View of one point of a Grid.\n
+    row, col etc come from the shared Cell, value etc are read from and written to the Grid """
+    __slots__ = ('grid', 'cell')
+
+    def __init__(self, grid: Grid, cell: Cell):
+        self.grid = grid
+        self.cell = cell
+
+    @property
+    def row(self) -> int:
+        return self.cell.row
+
+    @property
+    def col(self) -> int:
+        return self.cell.col
+
+    @property
+    def index(self) -> int:
+        """Position in reading order"""
+        return self.cell.index
 
     @property
     def bigrow(self) -> int:
         """Larger 3x3 grid"""
-        return int(self.row/3)
+        return self.cell.row // 3
 
     @property
     def bigcol(self) -> int:
         """Larger 3x3 grid"""
-        return int(self.col/3)
+        return self.cell.col // 3
+
+    @property
+    def box(self) -> int:
+        """Which 3x3 in reading order"""
+        return self.cell.box
+
+    @property
+    def value(self) -> int:
+        return self.grid.values[self.cell.index]
+
+    @value.setter
+    def value(self, value: int) -> None:
+        self.grid.values[self.cell.index] = value
+
+    @property
+    def failed(self) -> int:
+        """Mask of values that have been tried and failed"""
+        return self.grid.failed[self.cell.index]
+
+    @failed.setter
+    def failed(self, failed: int) -> None:
+        self.grid.failed[self.cell.index] = failed
+
+    @property
+    def _available(self) -> int:
+        """Mask of available values"""
+        return self.grid.available[self.cell.index]
+
+    @_available.setter
+    def _available(self, available: int) -> None:
+        self.grid.available[self.cell.index] = available
+
+    @property
+    def source(self) -> str:
+        return chr(self.grid.source[self.cell.index])
+
+    @source.setter
+    def source(self, source: str) -> None:
+        self.grid.source[self.cell.index] = ord(source)
+
+    def __repr__(self) -> str:
+        return f"Point(row={self.row}, col={self.col}, value={self.value}, source='{self.source}')"
 
 
 @dataclass
@@ -33,26 +93,125 @@ class Sudoku:
     startpos: str
     name: str = '<No Name>'
     points: list = field(default_factory=list[Point])
-    # Are classvars instead of Globals for smartness. Need to reset them if you are to run multiple solutions in 1 run
-    thinks: ClassVar[int] = 0
-    guesses: ClassVar[int] = 0
-    deductions: ClassVar[int] = 0
-    fails: ClassVar[int] = 0
-    maxlevel: ClassVar[int] = 0
+    # The actual state. Points are views of it
+    grid: Grid = field(default=None, repr=False)
+    # Number of empty points in each unit that could take each value. unit*9 + value-1
+    unitcounts: list = field(default_factory=list[int], repr=False)
+    # Indexes of the empty points grouped by number of available values
+    buckets: list = field(default_factory=list[set[int]], repr=False)
+    # Work for propagate. Points that may be down to 1 or 0 available values and units with a value that may have 1 or 0 places left
+    singles: list = field(default_factory=list[int], repr=False)
+    dirty: set = field(default_factory=set[int], repr=False)
+    # Undo log of (index, value, source, failed, available) saved before each change
+    trail: list = field(default_factory=list[tuple], repr=False)
+    # Where thinks, deductions and fails are counted. A Search replaces it with its own
+    stats: SolveStats = field(default_factory=SolveStats, repr=False, compare=False)
+    # A value is given twice in a row, column or 3x3, so there can't be a solution
+    broken: bool = field(default=False, repr=False)
+    # Set by observe and profile, which wrap methods on this Sudoku while either is in use
+    observer: Observer | None = field(default=None, repr=False, compare=False)
+    profiling: bool = field(default=False, repr=False, compare=False)
 
     def __post_init__(self):
-        # Fill with 0
-        self.points = list(Point(int(_/9), _ % 9) for _ in range(9*9))
+        if self.grid is None:
+            if self.startpos:
+                # Apply Start Posistion
+                self.grid = Grid.parse(self.startpos)
+            else:
+                # A default position if you have forgotten to pass one
+                self.grid = Grid()
+                self.grid.values[4+(9*4)] = 1
+        self.points = list(Point(self.grid, cell) for cell in CELLS)
+        if not self.unitcounts:
+            self.clearcache()
+        if self.observer is not None or self.profiling:
+            self._hook()
+
+    @classmethod
+    def fromgrid(cls, grid: Grid, name: str = '<No Name>') -> 'Sudoku':
+        """ Sudoku using an existing Grid as its state """
+        return cls(grid.tokenize(), name, grid=grid)
+
+    def reset(self, startpos: str | bytes | Grid, name: str = '<No Name>') -> None:
+        """ Start again from a new position, reusing the grid and points.\n
+        startpos can be a Grid, such as one read from a packed file, to skip parsing """
+        self.startpos = startpos
+        self.name = name
+        self.grid.load(startpos)
+        self.trail.clear()
+        self.clearcache()
 
-        point: Point
-        if self.startpos:
-            # Apply Start Posistion
-            for point in self.points:
-                c: str = f"{self.startpos:81}"[point.col+9*point.row]
-                point.value = int(c) if c in "123456789" else 0
-        else:
-            # A default position if you have forgotten to pass one
-            self.points[4+(9*4)].value = 1
+    def copy(self) -> 'Sudoku':
+        """ Independent copy of the current state. The trail is not copied so it can't be undone """
+        return Sudoku(self.startpos, self.name, grid=self.grid.copy(), unitcounts=self.unitcounts[:],
+                      buckets=list(set(_) for _ in self.buckets), singles=self.singles[:], dirty=set(self.dirty),
+                      broken=self.broken)
+
+    def observe(self, observer: Observer | None) -> None:
+        """ Call the observer on every place, eliminate, guess, backtrack and contradiction, None to stop.\n
+        place, fail and propagate are wrapped on this Sudoku only while it has an observer, so there is no cost otherwise.
+        Copies are not observed """
+        self.observer = observer
+        self._hook()
+
+    def profile(self, on: bool = True) -> None:
+        """ Add the ns spent in each phase of PHASES to stats.phases, on=False to stop.\n
+        Time in a phase called from another, such as candidates from place, only counts for the inner one.
+        Like observe, the methods are only wrapped while profiling. Copies are not profiled """
+        self.profiling = on
+        self._hook()
+
+    def _hook(self) -> None:
+        """ Wrap the methods for profiling and then the observer, starting again from the class methods each time
+        so either can be turned on or off in any order """
+        for name in _HOOKED:
+            self.__dict__.pop(name, None)
+        if self.profiling:
+            current = [None, 0]  # Phase being timed and when it started or was resumed
+
+            def timed(phase: str, method):
+                def wrapper(*args, **kwargs):
+                    phases = self.stats.phases
+                    outer, now = current[0], perf_counter_ns()
+                    if outer is not None:
+                        phases[outer] = phases.get(outer, 0) + now - current[1]
+                    current[0], current[1] = phase, now
+                    try:
+                        return method(*args, **kwargs)
+                    finally:
+                        now = perf_counter_ns()
+                        phases[phase] = phases.get(phase, 0) + now - current[1]
+                        current[0], current[1] = outer, now
+                return wrapper
+
+            for phase, names in PHASES.items():
+                for name in names:
+                    setattr(self, name, timed(phase, getattr(self, name)))
+        if (observer := self.observer) is None:
+            return
+        place, fail, propagate = self.place, self.fail, self.propagate
+
+        def observed_place(i: int, value: int, source: str = ' '):
+            if source not in ' =*':
+                observer.guess(i, value)
+            grid = self.grid
+            bit = BIT[value]
+            peers = [] if grid.values[i] or not value else [_ for _ in PEERS[i] if grid.available[_] & bit]
+            place(i, value, source)
+            observer.place(i, value, source)
+            for _ in peers:
+                observer.eliminate(_, value)
+
+        def observed_fail(i: int, value: int):
+            fail(i, value)
+            observer.backtrack(i, value)
+
+        def observed_propagate(deduce: bool = True) -> bool:
+            if not (ok := propagate(deduce)):
+                observer.contradiction()
+            return ok
+
+        self.place, self.fail, self.propagate = observed_place, observed_fail, observed_propagate
 
     def display(self, source: bool = False) -> None:
         """ Outputs the position in human readable format\n
@@ -60,7 +219,7 @@ class Sudoku:
              = Think, * Deduce, a 1st Guess, b 2nd Guess etc """
         point: Point
         if self.name:
-            print(f"{self.name} - {Sudoku.thinks+Sudoku.deductions+Sudoku.guesses}")
+            print(f"{self.name} - {self.stats.total}")
         for point in self.points:
             print(
                 f" {point.value if point.value else '.'}{point.source if source else ' '}{'|' if point.col==2 or point.col == 5 else ''}", end='')
@@ -70,139 +229,291 @@ class Sudoku:
                     print("---------+---------+---------")
         print('')
 
-    def onrow(self, point: Point) -> set[int]:
-        """Set of all values on the row of the point"""
-        return set(_.value for _ in self.points if (_.value != 0 and _.row == point.row))
-
-    def oncol(self, point: Point) -> set[int]:
-        """Set of all values on the column of the point"""
-        return set(_.value for _ in self.points if (_.value != 0 and _.col == point.col))
-
-    def in3x3(self, point: Point) -> set[int]:
-        """Set of all values in the same 3x3 of the point"""
-        return set(_.value for _ in self.points if (_.value != 0 and _.bigrow == point.bigrow and _.bigcol == point.bigcol))
-
-    def used(self, point: Point) -> set[int]:
-        """Set of values that are not available"""
-        return self.oncol(point) | self.onrow(point) | self.in3x3(point) | point.failed
-
-    def available(self, point: Point) -> set[int]:
-        """Set of available values.\n
-        Value is Cached for speed. Need to run clearcache if state is altered"""
-        if point.value == 0 and not point._available:
-            point._available = {1, 2, 3, 4, 5, 6, 7, 8, 9} - self.used(point)
-        return point._available
-
-    def deduce(self, point: Point) -> set[int]:
-        """ Deduce if this point has only 1 possible value """
-        deducerow = set()
-        deducecol = set()
-        p: Point
-        for p in self.points:
-            if point != p and p.value == 0:
-                if point.row == p.row:
-                    deducerow |= self.available(p)
-                elif point.col == p.col:
-                    deducecol |= self.available(p)
-
-        # if (len(ans := self.available(point)-deducerow)) == 1 and ans == self.available(point)-deducecol:
-        if (len(ans := self.available(point)-deducerow)) == 1 or (len(ans := self.available(point)-deducecol)) == 1:
-            return ans
-        else:
-            return set()
+    def onrow(self, point: Point) -> int:
+        """Mask of all values on the row of the point"""
+        values = self.grid.values
+        ans = 0
+        for _ in ROWS[point.row]:
+            ans |= BIT[values[_]]
+        return ans
+
+    def oncol(self, point: Point) -> int:
+        """Mask of all values on the column of the point"""
+        values = self.grid.values
+        ans = 0
+        for _ in COLS[point.col]:
+            ans |= BIT[values[_]]
+        return ans
 
-    def deduced(self) -> list[set[Point]]:
+    def in3x3(self, point: Point) -> int:
+        """Mask of all values in the same 3x3 of the point"""
+        values = self.grid.values
+        ans = 0
+        for _ in BOXES[point.box]:
+            ans |= BIT[values[_]]
+        return ans
+
+    def used(self, point: Point) -> int:
+        """Mask of values that are not available"""
+        return self._used(point.cell.index)
+
+    def _used(self, i: int) -> int:
+        values = self.grid.values
+        ans = self.grid.failed[i]
+        for _ in PEERS[i]:
+            ans |= BIT[values[_]]
+        return ans
+
+    def available(self, point: Point) -> int:
+        """Mask of available values.\n
+        Kept up to date by setpoint and failed. Need to run clearcache if state is altered directly"""
+        return self.grid.available[point.cell.index]
+
+    def unitcount(self, unit: int, value: int) -> int:
+        """Number of empty points in the unit that could take the value"""
+        return self.unitcounts[unit*9 + value-1]
+
+    def deduce(self, point: Point) -> int:
+        """ Deduce if this point is the only place in its row, column or 3x3 for a value """
+        i = point.cell.index
+        available = self.grid.available[i]
+        counts = self.unitcounts
+        ans = 0
+        for unit in CELL_UNITS[i]:
+            for v in DIGITS[available]:
+                if counts[unit*9 + v-1] == 1:
+                    ans |= BIT[v]
+        # More than 1 means the position is invalid, so nothing can be deduced
+        return ans if POPCOUNT[ans] == 1 else 0
+
+    def deduced(self) -> list[Point]:
         ## List of points that can be deduced to a single value using the more advance method ##
-        ans = list(p for p in self.points if p.value == 0 and len(
-            self.available(p)) > 1 and self.deduce(p))
+        available = self.grid.available
+        ans = list(p for p in self.points if POPCOUNT[available[p.cell.index]] > 1 and self.deduce(p))
         return ans
 
-    def todo(self) -> list[set[Point]]:
-        """List of all Points with no value sorted by number of available values"""
-        # NB Its a shallow copy so changes are reflected in self.grid
-        ans = (p for p in self.points if p.value == 0)
-        return sorted(ans, key=lambda p: len(self.available(p)))
+    def todo(self) -> list[Point]:
+        """List of all Points with no value sorted by number of available values, then position"""
+        # NB Points are views so changes are reflected in self.grid
+        return list(self.points[i] for bucket in self.buckets for i in sorted(bucket))
+
+    def best(self) -> Point | None:
+        """The Point with no value that has the fewest available values, None when all have a value.\n
+        Ties go to the first in reading order, so the choice only depends on the position and not on how it was reached """
+        for bucket in self.buckets:
+            if bucket:
+                return self.points[min(bucket)]
+        return None
 
     def tokenize(self, source: bool = False) -> str:
         """ Returns the state as a single string """
-        if source:
-            return ''.join(p.source for p in self.points)
-        else:
-            return ''.join('.' if p.value == 0 else str(p.value) for p in self.points)
+        return self.grid.tokenize(source)
 
     def clearcache(self) -> None:
-        """ Clear the cache so available is recalculated """
-        p: Point
-        for p in self.points:
-            p._available = set()
+        """ Recalculate all available values and unit counts from scratch, and check no value is there twice in a unit """
+        values = self.grid.values
+        masks = self.grid.available
+        self.broken = False
+        for cells in UNITS:
+            placed = 0
+            for _ in cells:
+                if placed & (bit := BIT[values[_]]):
+                    self.broken = True
+                placed |= bit
+        self.unitcounts = [0] * (27*9)
+        self.buckets = list(set() for _ in range(10))
+        for i in range(81):
+            masks[i] = 0
+        for i in range(81):
+            if values[i] == 0:
+                self._restrict(i, ALL & ~self._used(i))
+        # Everything needs checking
+        self.singles = list(self.buckets[0] | self.buckets[1])
+        self.dirty = set(range(27))
+
+    def restrict(self, point: Point, available: int) -> None:
+        """ Change the available values of a point, keeping the unit counts in step """
+        self._restrict(point.cell.index, available)
+
+    def _restrict(self, i: int, available: int) -> None:
+        masks = self.grid.available
+        old = masks[i]
+        if old != available:
+            counts = self.unitcounts
+            dirty = self.dirty
+            for unit in CELL_UNITS[i]:
+                for v in DIGITS[old & ~available]:
+                    counts[k := unit*9 + v-1] -= 1
+                    if counts[k] < 2:
+                        dirty.add(unit)
+                for v in DIGITS[available & ~old]:
+                    counts[unit*9 + v-1] += 1
+            masks[i] = available
+            if POPCOUNT[available] < 2 and not available & ~old and not self.grid.values[i]:
+                self.singles.append(i)
+        # Move between buckets, points with a value are in none
+        buckets = self.buckets
+        buckets[POPCOUNT[old]].discard(i)
+        if not self.grid.values[i]:
+            buckets[POPCOUNT[available]].add(i)
+
+    def save(self, point: Point) -> None:
+        """ Record the state of a point on the trail before it is changed """
+        self._save(point.cell.index)
+
+    def _save(self, i: int) -> None:
+        grid = self.grid
+        self.trail.append((i, grid.values[i], grid.source[i], grid.failed[i], grid.available[i]))
+
+    def mark(self) -> int:
+        """ Position on the trail to undo back to """
+        return len(self.trail)
+
+    def undo(self, mark: int) -> None:
+        """ Roll back every change made since the mark """
+        trail = self.trail
+        values, source, failed = self.grid.values, self.grid.source, self.grid.failed
+        while len(trail) > mark:
+            i, values[i], source[i], failed[i], available = trail.pop()
+            self._restrict(i, available)
 
     def setpoint(self, point: Point, value: int, source: str = ' '):
-        """ Set a point and clear cache"""
-        point.value = value
-        point.source = source
-        self.clearcache()
+        """ Set a point and remove the value from its peers """
+        self.place(point.cell.index, value, source)
+
+    def place(self, i: int, value: int, source: str = ' '):
+        """ setpoint by index """
+        grid = self.grid
+        if grid.values[i] or not value:
+            # Overwriting or clearing a value could make values available again anywhere
+            for _ in range(81):
+                self._save(_)
+            grid.values[i] = value
+            grid.source[i] = ord(source)
+            self.clearcache()
+            return
+        self._save(i)
+        grid.values[i] = value
+        grid.source[i] = ord(source)
+        self._restrict(i, 0)
+        bit = BIT[value]
+        masks = grid.available
+        for _ in PEERS[i]:
+            if masks[_] & bit:
+                self._save(_)
+                self._restrict(_, masks[_] & ~bit)
 
     def failed(self, point: Point, value: int):
         """ Record a failure """
-        Sudoku.fails += 1
-        point.failed.add(value)
-        self.clearcache()
-
-
-def solve(s: Sudoku, level: int, deduce: bool = True):
-    """ Solves a Sukdoku and displays the result.\nIf it has to guess, it will recurse """
-    global starttime
-    todo: Point
-    if starttime == 0:
-        starttime = perf_counter()
-    Sudoku.maxlevel = max(Sudoku.maxlevel, level)
-
-    # Known values
-    while s.todo() and (len(s.available(s.todo()[0])) == 1 or (deduce and s.deduced())):
-        if len(s.available(s.todo()[0])) == 1:
-            todo = s.todo()[0]
-            available = s.available(todo)
-            s.setpoint(todo, next(iter(available)), '=')
-            Sudoku.thinks += 1
-
-        else:
-            # We can deduce a/some points
-            todo = s.deduced()[0]
-            available = s.deduce(todo)
-            s.setpoint(todo, next(iter(available)), '*')
-            Sudoku.deductions += 1
-
-    # Going to have to guess
-    while s.todo():
-        todo = s.todo()[0]   # Pick the best point to try
-        # Check there is a value left to try
-        if available := s.available(todo):
-            use = next(iter(available))  # Value to try
-            nextlevel = deepcopy(s)  # Make a copy of the current state
-            nexttodo: Point = nextlevel.todo()[0]
-            nextlevel.setpoint(nexttodo, use, 'abcedfghijk'[
-                               len(nexttodo.failed)])
-            Sudoku.guesses += 1
-            # print('.' * level)
-            # nextlevel.display()
-            # Recurse to solve remaining points
-            if solve(nextlevel, level+1, deduce):
-                return True  # We have a Solution !
-            else:
-                # The guess does not lead to a solution, try another on this level
-                s.failed(todo, use)
-        else:
-            # ANY point with no possible values means not a valid solution
+        self.fail(point.cell.index, value)
+
+    def fail(self, i: int, value: int):
+        """ failed by index """
+        self.stats.fails += 1
+        self._save(i)
+        self.grid.failed[i] |= BIT[value]
+        self._restrict(i, self.grid.available[i] & ~BIT[value])
+
+    def propagate(self, deduce: bool = True) -> bool:
+        """ Set every point that is known, only looking at the points and units that have changed.\n
+        deduce=True will also set values that only have 1 place left in a unit.\n
+        Returns False as soon as a point has no available values or a value has nowhere to go in a unit """
+        grid = self.grid
+        values, masks = grid.values, grid.available
+        singles, dirty = self.singles, self.dirty
+        if self.broken:
+            singles.clear()
+            dirty.clear()
             return False
-
-    # We only get here when all points have a value
+        while singles or dirty:
+            if singles:
+                i = singles.pop()
+                if values[i]:
+                    continue
+                if (available := masks[i]) == 0:
+                    break
+                if POPCOUNT[available] == 1:
+                    self.place(i, LOWEST[available], '=')
+                    self.stats.thinks += 1
+            elif not self._checkunit(dirty.pop(), deduce):
+                break
+        else:
+            return True
+        # Contradiction, the rest of the work is pointless
+        singles.clear()
+        dirty.clear()
+        return False
+
+    def _checkunit(self, unit: int, deduce: bool) -> bool:
+        """ False if a value has nowhere to go in the unit.\n
+        deduce=True will set values that only have 1 place """
+        values, masks = self.grid.values, self.grid.available
+        counts = self.unitcounts
+        cells = UNITS[unit]
+        placed = 0
+        for _ in cells:
+            placed |= BIT[values[_]]
+        for v in DIGITS[ALL & ~placed]:
+            if (count := counts[unit*9 + v-1]) == 0:
+                return False
+            if count == 1 and deduce:
+                bit = BIT[v]
+                for i in cells:
+                    if masks[i] & bit:
+                        self.place(i, v, '*')
+                        self.stats.deductions += 1
+                        break
+        return True
+
+
+def solve(s: Sudoku, level: int = 0, deduce: bool = True,
+          stats: SolveStats | None = None) -> bool:
+    """ Solves a Sukdoku and displays the result.\nIf it has to guess, Search keeps the guesses on its own stack.\n
+    The counts are left in s.stats, which is stats if one is passed with them added as if the puzzle was level guesses deep """
+    stats = SolveStats() if stats is None else stats
+    search = Search(s, deduce)
+    solved = search.run()
+    stats.add(search.stats, level)
+    s.stats = stats
+    if solved:
+        report(s)
+    return solved
+
+
+def solve_dlx(s: Sudoku, level: int = 0, deduce: bool = True,
+              stats: SolveStats | None = None) -> bool:
+    """ Solves a Sudoku with Dancing Links and displays the result, the same as solve.\n
+    Dancing Links always finds the only place for a value, so deduce has no effect """
+    stats = SolveStats() if stats is None else stats
+    solved, counts = run_dlx(s, deduce)
+    stats.add(counts, level)
+    s.stats = stats
+    if solved:
+        report(s)
+    return solved
+
+
+def run_dlx(s: Sudoku, deduce: bool = True) -> tuple[bool, SolveStats]:
+    """ Solves a Sudoku in place with Dancing Links without displaying anything. Returns (solved, stats) """
+    dlx = DancingLinks(s.grid.values)
+    if (solution := dlx.solve()) is None:
+        return False, dlx.stats
+    for i, value, source in solution:
+        s.place(i, value, source)
+    return True, dlx.stats
+
+
+def report(s: Sudoku) -> None:
+    """ Displays a solved Sudoku and a summary of how it was solved from its stats """
+    stats = s.stats
     s.display()
     print(
-        f"Solved {s.name} with {Sudoku.thinks} thoughts, {Sudoku.deductions} deductions, {Sudoku.guesses} guesses, {Sudoku.fails} fails, {Sudoku.maxlevel} Max Level. {int(perf_counter()-starttime)}s")
+        f"Solved {s.name} with {stats.thinks} thoughts, {stats.deductions} deductions, {stats.guesses} guesses, {stats.fails} fails, {stats.maxlevel} Max Level. {stats.seconds:.3f}s")
+    if stats.phases:
+        print(', '.join(f"{phase} {ns/1e6:.1f}ms" for phase, ns in stats.breakdown().items()))
     # print(s.tokenize())
     # print(s.tokenize(True))
     print(', '.join(f"({k}){v}" for k, v in Counter(s.tokenize(True)).items()))
-    return True
 
 
 if __name__ == '__main__':
@@ -261,4 +572,7 @@ if __name__ == '__main__':
 
     print('Solving...')
     s.display()
+    # s.profile()  # Show the time spent in each phase with the counts
+    # from observe import Trace; s.observe(trace := Trace())  # Keep every place, eliminate, guess, backtrack and contradiction
     solve(s, 0)
+    # solve_dlx(s)  # Dancing Links instead
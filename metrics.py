@@ -0,0 +1,206 @@
+""" Metrics for batch runs.\n
+BatchMetrics takes the SolveResults of a run as they arrive and keeps a latency histogram, the guesses
+each puzzle needed, puzzles solved in each interval and the slowest puzzles. Memory doesn't grow with the
+number of puzzles, so it suits runs of millions. Export as JSON, CSV or Prometheus text """
+import csv
+import heapq
+import json
+import os
+from bisect import bisect_left
+from collections import Counter
+from time import perf_counter
+from typing import Iterable, Iterator
+from batch import SolveResult
+
+PRECISION = 4  # Bits kept below the leading bit, so values are counted to within 1/16
+# Upper bounds of the Prometheus buckets, the same every time so series line up between scrapes
+SECONDS = tuple(m * 10**e for e in range(-5, 2) for m in (1, 2, 5)) + (100,)
+GUESSES = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class Histogram:
+    """ Counts of values in log buckets, as HDR histograms do.\n
+    Values below 2**(PRECISION+1) have a bucket each. Above that each power of 2 is split into
+    2**PRECISION buckets, so a bucket is never wider than 1/16 of its values """
+
+    def __init__(self):
+        self.counts: Counter[int] = Counter()  # By bucket
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket(value: int) -> int:
+        shift = max(0, value.bit_length() - PRECISION - 1)
+        return (shift << PRECISION) + (value >> shift)
+
+    @staticmethod
+    def bounds(bucket: int) -> tuple[int, int]:
+        """ Lowest value in the bucket and the lowest in the next """
+        shift = max(0, (bucket >> PRECISION) - 1)
+        top = bucket - (shift << PRECISION)
+        return top << shift, (top+1) << shift
+
+    def record(self, value: int) -> None:
+        self.counts[self.bucket(value)] += 1
+        self.min = value if not self.count else min(self.min, value)
+        self.max = max(self.max, value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p: float) -> int:
+        """ Highest value in the bucket holding the p (0-100) percentile, never more than max """
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count*p // 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self.max, self.bounds(bucket)[1] - 1)
+        return self.max
+
+    def buckets(self) -> list[tuple[int, int, int]]:
+        """ (lowest, next lowest, count) of every bucket with a count, in order """
+        return list((*self.bounds(_), self.counts[_]) for _ in sorted(self.counts))
+
+
+class BatchMetrics:
+    """ Aggregate metrics of the results of a batch run.\n
+    interval is the seconds covered by each entry of throughput, top the number of slowest puzzles kept """
+
+    def __init__(self, interval: float = 1.0, top: int = 10):
+        self.interval = interval
+        self.top = top
+        self.latency = Histogram()  # ns
+        self.ladder = [0] * len(SECONDS)  # Puzzles in each SECONDS bucket that aren't in the one before
+        self.guesses: Counter[int] = Counter()  # Puzzles by number of guesses
+        self.throughput: list[int] = []  # Puzzles finished in each interval
+        self.slowest: list[tuple[int, int, str]] = []  # Heap of (elapsed, index, name)
+        self.unsolved = 0
+        self.start = perf_counter()
+
+    def record(self, result: SolveResult) -> None:
+        self.latency.record(result.elapsed)
+        if (k := bisect_left(SECONDS, result.elapsed / 1e9)) < len(SECONDS):
+            self.ladder[k] += 1
+        self.guesses[result.guesses] += 1
+        if not result.solved:
+            self.unsolved += 1
+        k = int((perf_counter() - self.start) / self.interval)
+        if k >= len(self.throughput):
+            self.throughput.extend([0] * (k+1 - len(self.throughput)))
+        self.throughput[k] += 1
+        entry = (result.elapsed, result.index, result.name)
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, entry)
+        elif self.top:
+            heapq.heappushpop(self.slowest, entry)
+
+    def watch(self, results: Iterable[SolveResult]) -> Iterator[SolveResult]:
+        """ Record each result while passing it on, such as metrics.watch(solve_pool(puzzles)) """
+        for result in results:
+            self.record(result)
+            yield result
+
+    def summary(self) -> dict:
+        """ Everything as a dict ready for json. Times are ns """
+        latency = self.latency
+        seconds = perf_counter() - self.start
+        return {
+            'puzzles': latency.count, 'unsolved': self.unsolved, 'seconds': seconds,
+            'per_second': latency.count / seconds if seconds else 0.0,
+            'latency': {'min': latency.min, 'mean': latency.total // latency.count if latency.count else 0,
+                        'p50': latency.percentile(50), 'p90': latency.percentile(90),
+                        'p99': latency.percentile(99), 'max': latency.max, 'total': latency.total},
+            'histogram': list({'from': lo, 'to': hi, 'count': n} for lo, hi, n in latency.buckets()),
+            'guesses': {str(k): self.guesses[k] for k in sorted(self.guesses)},
+            'interval': self.interval, 'throughput': self.throughput,
+            'slowest': list({'index': index, 'name': name, 'elapsed': elapsed}
+                            for elapsed, index, name in sorted(self.slowest, reverse=True))}
+
+    def write_json(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=1)
+
+    def write_csv(self, path: str) -> None:
+        """ One row per value as (section, key, value, name), such as (latency, p99, 1234) or (histogram, 1024, 7)
+        where the key of a histogram row is the lowest ns in the bucket.\n
+        Slowest rows are keyed by the index of the puzzle, as names need not be unique, with the name after """
+        summary = self.summary()
+        with open(path, 'w', newline='') as f:
+            out = csv.writer(f)
+            out.writerow(('section', 'key', 'value', 'name'))
+            for key in ('puzzles', 'unsolved', 'seconds', 'per_second'):
+                out.writerow(('run', key, summary[key]))
+            out.writerows(('latency', key, value) for key, value in summary['latency'].items())
+            out.writerows(('histogram', _['from'], _['count']) for _ in summary['histogram'])
+            out.writerows(('guesses', key, value) for key, value in summary['guesses'].items())
+            out.writerows(('throughput', k*self.interval, value) for k, value in enumerate(self.throughput))
+            out.writerows(('slowest', _['index'], _['elapsed'], _['name']) for _ in summary['slowest'])
+
+    def prometheus(self) -> str:
+        """ The metrics in Prometheus text format with buckets at SECONDS and GUESSES. Times are seconds.\n
+        Percentiles are left to histogram_quantile """
+        latency = self.latency
+        lines = ['# HELP sudoku_solve_seconds Time to solve each puzzle',
+                 '# TYPE sudoku_solve_seconds histogram']
+        seen = 0
+        for le, n in zip(SECONDS, self.ladder):
+            seen += n
+            lines.append(f'sudoku_solve_seconds_bucket{{le="{le:g}"}} {seen}')
+        lines += [f'sudoku_solve_seconds_bucket{{le="+Inf"}} {latency.count}',
+                  f'sudoku_solve_seconds_sum {latency.total/1e9:.9g}',
+                  f'sudoku_solve_seconds_count {latency.count}',
+                  '# HELP sudoku_guesses Guesses needed by each puzzle',
+                  '# TYPE sudoku_guesses histogram']
+        for le in GUESSES:
+            lines.append(f'sudoku_guesses_bucket{{le="{le}"}} {sum(n for k, n in self.guesses.items() if k <= le)}')
+        seen = latency.count
+        lines += [f'sudoku_guesses_bucket{{le="+Inf"}} {seen}',
+                  f'sudoku_guesses_sum {sum(k*n for k, n in self.guesses.items())}',
+                  f'sudoku_guesses_count {seen}',
+                  '# TYPE sudoku_puzzles_total counter', f'sudoku_puzzles_total {latency.count}',
+                  '# TYPE sudoku_unsolved_total counter', f'sudoku_unsolved_total {self.unsolved}']
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """ Written to a temporary file and renamed, so a collector reading the path never sees half of it """
+        with open(path + '.tmp', 'w') as f:
+            f.write(self.prometheus())
+        os.replace(path + '.tmp', path)
+
+    def report(self) -> None:
+        """ Print the main figures """
+        s = self.summary()
+        lat = s['latency']
+        print(f"{s['puzzles']} puzzles, {s['unsolved']} unsolved in {s['seconds']:.2f}s, {s['per_second']:.1f} puzzles/s")
+        print(f"p50 {lat['p50']/1e6:.2f}ms p90 {lat['p90']/1e6:.2f}ms p99 {lat['p99']/1e6:.2f}ms max {lat['max']/1e6:.2f}ms")
+        for _ in s['slowest']:
+            print(f"  {_['elapsed']/1e6:10.2f}ms {_['name'] or _['index']}")
+
+
+if __name__ == '__main__':
+    import argparse
+    from dataset import read_puzzles
+    from pool import solve_pool
+    parser = argparse.ArgumentParser(description="Solve a file of puzzles and export metrics of the run")
+    parser.add_argument('file', help="Puzzle file, one per line")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--top', type=int, default=10, help="Slowest puzzles to keep")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds for each throughput entry")
+    parser.add_argument('--json')
+    parser.add_argument('--csv')
+    parser.add_argument('--prom', help="Prometheus text file")
+    args = parser.parse_args()
+    metrics = BatchMetrics(args.interval, args.top)
+    for _ in metrics.watch(solve_pool(read_puzzles(args.file), args.workers, ordered=False)):
+        pass
+    metrics.report()
+    if args.json:
+        metrics.write_json(args.json)
+    if args.csv:
+        metrics.write_csv(args.csv)
+    if args.prom:
+        metrics.write_prometheus(args.prom)
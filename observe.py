@@ -0,0 +1,45 @@
+""" Watching a solve as it happens.\n
+Give an Observer to Sudoku.observe and it is called as the solver works. Sudoku only wraps its methods
+while it has an observer, so a Sudoku that isn't observed runs exactly the same code as before """
+
+
+class Observer:
+    """ Does nothing on each event, override the ones of interest.\n
+    i is the index of a point in reading order """
+
+    def place(self, i: int, value: int, source: str) -> None:
+        """ A value was set. source is '=' think, '*' deduce, a letter for a guess or ' ' for given """
+
+    def eliminate(self, i: int, value: int) -> None:
+        """ A value is no longer available to a peer of a point that was just set """
+
+    def guess(self, i: int, value: int) -> None:
+        """ A value is about to be guessed, place follows """
+
+    def backtrack(self, i: int, value: int) -> None:
+        """ A value has failed and will not be tried again from here """
+
+    def contradiction(self) -> None:
+        """ A point has no available values or a value has nowhere to go in a unit """
+
+
+class Trace(Observer):
+    """ Keeps every event as a tuple of (event, index, value, source) """
+
+    def __init__(self):
+        self.events: list[tuple[str, int, int, str]] = []
+
+    def place(self, i: int, value: int, source: str) -> None:
+        self.events.append(('place', i, value, source))
+
+    def eliminate(self, i: int, value: int) -> None:
+        self.events.append(('eliminate', i, value, ''))
+
+    def guess(self, i: int, value: int) -> None:
+        self.events.append(('guess', i, value, ''))
+
+    def backtrack(self, i: int, value: int) -> None:
+        self.events.append(('backtrack', i, value, ''))
+
+    def contradiction(self) -> None:
+        self.events.append(('contradiction', -1, 0, ''))
@@ -0,0 +1,138 @@
+""" Packed binary file of puzzles or solutions, 4 bits per point so 41 bytes each.\n
+Header, then fixed size records, then an optional index of names:\n
+    header      magic 'SDKP', version, kind (0 puzzles 1 solutions), record size, count, offset of the names\n
+    records     point 0 in the high 4 bits of the first byte, point 1 in the low 4 bits and so on\n
+    names       count+1 offsets (uint64) into the utf-8 text that follows them, only if any puzzle has a name\n
+Records decode straight into a Grid's values, there is no 81 character string in between """
+import mmap
+import os
+from array import array
+from struct import Struct
+from typing import Iterable, Iterator
+from batch import Puzzle, topuzzle
+from grid import Grid
+
+MAGIC = b'SDKP'
+VERSION = 1
+PUZZLES, SOLUTIONS = 0, 1
+RECORD = 41
+
+# magic, version, kind, record size, count, offset of the names (0 if none)
+_HEADER = Struct('<4sBBHIQ')
+# Each byte becomes the values of 2 points
+_UNPACK: tuple[bytes, ...] = tuple(bytes((b >> 4, b & 15)) for b in range(256))
+
+
+def pack(values: bytes | bytearray) -> bytes:
+    """ 41 byte record from 81 values """
+    return bytes(values[k] << 4 | (values[k+1] if k < 80 else 0) for k in range(0, 81, 2))
+
+
+def unpack(record: bytes) -> bytes:
+    """ 81 values from a 41 byte record """
+    return b''.join([_UNPACK[b] for b in record])[:81]
+
+
+def write_packed(path: str, puzzles: Iterable[str | bytes | Grid | tuple], kind: int = PUZZLES) -> int:
+    """ Writes each puzzle, or solution with kind=SOLUTIONS, returning how many were written.\n
+    Each is a start position as str, bytes or Grid, or a (position, name) pair.\n
+    The file is written to a temporary file and renamed, so path is left alone if anything goes wrong """
+    try:
+        count = _write(path + '.tmp', puzzles, kind)
+    except BaseException:
+        if os.path.exists(path + '.tmp'):
+            os.remove(path + '.tmp')
+        raise
+    os.replace(path + '.tmp', path)
+    return count
+
+
+def _write(path: str, puzzles: Iterable, kind: int) -> int:
+    offsets = array('Q', [0])
+    names = []
+    with open(path, 'wb') as f:
+        f.write(bytes(_HEADER.size))  # Filled in at the end when the count is known
+        for startpos, name in map(topuzzle, puzzles):
+            f.write(pack(startpos.values if isinstance(startpos, Grid) else Grid.parse(startpos).values))
+            names.append(text := name.encode('utf-8'))
+            offsets.append(offsets[-1] + len(text))
+        count = len(names)
+        nameoffset = 0
+        if offsets[-1]:
+            nameoffset = f.tell()
+            f.write(offsets.tobytes())
+            f.write(b''.join(names))
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, kind, RECORD, count, nameoffset))
+    return count
+
+
+class PackedFile:
+    """ A memory mapped packed file. Iterate for each Puzzle in turn or index it for random access.\n
+    The start position of each Puzzle is a Grid """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path} is not a packed file")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.kind, self.recordsize, self.count, self._names = _HEADER.unpack_from(self._data)
+        if magic != MAGIC or version > VERSION or self.recordsize != RECORD:
+            self.close()
+            raise ValueError(f"{path} is not a packed file this version can read")
+        size = len(self._data)
+        end = _HEADER.size + self.count*RECORD
+        if self._names:
+            if end <= self._names <= size - 8*(self.count+1):
+                self._offsets = array('Q', self._data[self._names:self._names + 8*(self.count+1)])
+                end = self._names + 8*(self.count+1) + self._offsets[-1]
+            else:
+                end = size + 1
+        if size < end:
+            self.close()
+            raise ValueError(f"{path} is shorter than its header says, it may have been cut off")
+
+    def values(self, index: int) -> bytes:
+        """ The 81 values of a record """
+        if not -self.count <= index < self.count:
+            raise IndexError(index)
+        start = _HEADER.size + (index % self.count) * RECORD
+        return unpack(self._data[start:start+RECORD])
+
+    def grid(self, index: int) -> Grid:
+        return Grid(self.values(index))
+
+    def name(self, index: int) -> str:
+        if not self._names:
+            return ''
+        index %= self.count
+        text = self._names + 8*(self.count+1)
+        return self._data[text+self._offsets[index]:text+self._offsets[index+1]].decode('utf-8')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Puzzle:
+        return Puzzle(self.grid(index), self.name(index))
+
+    def __iter__(self) -> Iterator[Puzzle]:
+        for index in range(self.count):
+            yield self[index]
+
+    def close(self) -> None:
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> 'PackedFile':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_packed(path: str) -> Iterator[Puzzle]:
+    """ Each Puzzle in a packed file, closing it at the end """
+    with PackedFile(path) as puzzles:
+        yield from puzzles
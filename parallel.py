@@ -0,0 +1,89 @@
+""" Solving one hard puzzle across processes.\n
+The first few levels of guesses are expanded into separate subproblems, one per combination of guesses
+that propagate doesn't rule out. Each is solved by a worker and the rest are stopped as soon as one finds
+the solution """
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from time import perf_counter_ns
+from batch import SolveResult, totext
+from bits import DIGITS
+from grid import Grid
+from main import Sudoku
+from search import GUESSES, NODES, Search
+from stats import SolveStats
+
+_stop = None  # Event set when any worker has the solution, one per worker process
+
+
+def _init(stop) -> None:
+    global _stop
+    _stop = stop
+
+
+def split(search: Search, depth: int) -> list[Sudoku]:
+    """ Positions after every combination of guesses for the first depth levels.\n
+    Each level guesses every available value of the best point, so together they cover the whole search.\n
+    Guesses that propagate rules out are dropped. If one has no points left to guess it is the only one returned """
+    parts = [search.s] if search.ok else []
+    for _ in range(depth):
+        children = []
+        for s in parts:
+            if (point := s.best()) is None:
+                return [s]
+            i = point.cell.index
+            for k, v in enumerate(DIGITS[s.grid.available[i]]):
+                child = s.copy()
+                child.stats = search.stats
+                child.place(i, v, GUESSES[k])
+                search.stats.guesses += 1
+                if child.propagate(search.deduce):
+                    children.append(child)
+                else:
+                    search.stats.fails += 1
+        parts = children
+    search.stats.maxlevel = max(search.stats.maxlevel, depth if parts else 0)
+    return parts
+
+
+def _solvepart(data: bytes, deduce: bool) -> tuple[str | None, SolveStats]:
+    """ (solution or None, stats) for one subproblem from Grid.dumps, stopping early if another worker has the solution """
+    search = Search(Sudoku.fromgrid(Grid.loads(data)), deduce)
+    while (result := search.run(NODES)) is None and not _stop.is_set():
+        pass
+    return (search.s.tokenize() if result else None), search.stats
+
+
+def solve_parallel(startpos: str | bytes, depth: int = 2, workers: int | None = None, deduce: bool = True,
+                   name: str = '') -> SolveResult:
+    """ Solves a single puzzle with the guesses below the first depth levels spread over worker processes.\n
+    The counts include the work done by every worker up to when it stopped """
+    start = perf_counter_ns()
+    search = Search(Sudoku(startpos, name), deduce)
+    result = SolveResult(0, totext(startpos), None, name=name)
+    parts = split(search, depth)
+    if len(parts) == 1 and parts[0].best() is None:
+        result.solution = parts[0].tokenize()
+    elif parts:
+        context = multiprocessing.get_context()
+        stop = context.Event()
+        with ProcessPoolExecutor(workers or os.cpu_count() or 1, mp_context=context,
+                                 initializer=_init, initargs=(stop,)) as pool:
+            pending = set(pool.submit(_solvepart, s.grid.dumps(), deduce) for s in parts)
+            finished = []
+            while pending and result.solution is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished.append(future)
+                    if (solution := future.result()[0]) is not None:
+                        result.solution = solution
+                        stop.set()
+            for future in pending:
+                # Either never started or stopping now that stop is set
+                if not future.cancel():
+                    finished.append(future)
+        for future in finished:
+            search.stats.add(future.result()[1], depth)
+    result.thinks, result.deductions, result.guesses, result.fails, result.maxlevel = search.stats.counts
+    result.elapsed = perf_counter_ns() - start
+    return result
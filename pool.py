@@ -0,0 +1,67 @@
+""" Solving a stream of puzzles across processes.\n
+Puzzles are sent to the workers in chunks. Each worker builds its Solver once when it starts """
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator
+from batch import Puzzle, SolveResult, Solver, topuzzle
+from grid import Grid
+
+# AI Escargot, enough to touch every part of the solver when a worker starts
+WARMUP = '1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..'
+
+_solver: Solver | None = None  # One per worker process
+
+
+def _warmup(deduce: bool, backend: str) -> None:
+    global _solver
+    _solver = Solver(deduce, backend)
+    _solver.solve(WARMUP)
+
+
+def _solvechunk(start: int, chunk: list[Puzzle]) -> list[SolveResult]:
+    return list(_solver.solve(startpos, start+k, name) for k, (startpos, name) in enumerate(chunk))
+
+
+def chunks(puzzles: Iterable[str | bytes | Grid | tuple], chunksize: int) -> Iterator[tuple[int, list[Puzzle]]]:
+    """ (index of the first puzzle, list of puzzles) for each chunk """
+    puzzles = iter(puzzles)
+    start = 0
+    while chunk := list(topuzzle(p) for p in islice(puzzles, chunksize)):
+        yield start, chunk
+        start += len(chunk)
+
+
+def solve_pool(puzzles: Iterable[str | bytes | Grid | tuple], workers: int | None = None, chunksize: int = 256, ordered: bool = True,
+               deduce: bool = True, backend: str = 'search') -> Iterator[SolveResult]:
+    """ Solves the puzzles in worker processes, yielding a SolveResult for each.\n
+    ordered=True yields in input order, otherwise as each chunk completes.\n
+    Only a few chunks per worker are in flight, so the input can be a very long stream """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_warmup, initargs=(deduce, backend)) as pool:
+        yield from dispatch(pool, _solvechunk, puzzles, chunksize, ordered, 2*workers)
+
+
+def dispatch(executor: Executor, solvechunk, puzzles: Iterable[str | bytes | Grid | tuple], chunksize: int,
+             ordered: bool, inflight: int) -> Iterator:
+    """ Sends chunks to solvechunk(start, chunk) in the executor with at most inflight chunks waiting,
+    yielding each item of the lists it returns in input order or as each chunk completes """
+    pending = deque()
+    for start, chunk in chunks(puzzles, chunksize):
+        pending.append(executor.submit(solvechunk, start, chunk))
+        if len(pending) >= inflight:
+            yield from _collect(pending, ordered)
+    while pending:
+        yield from _collect(pending, ordered)
+
+
+def _collect(pending: deque, ordered: bool) -> Iterator:
+    """ Results of the next chunk in order, or of every chunk that has completed """
+    if ordered:
+        yield from pending.popleft().result()
+        return
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield from future.result()
@@ -0,0 +1,17 @@
+""" The reference puzzles, as in the examples in main.py """
+from batch import Puzzle
+
+REFERENCE = [
+    Puzzle('8..........36......7..9.2...5...7.......457.....1...3...1....68..8...51..9....4..', 'Arto Inkala - ABC News'),
+    Puzzle('1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..', 'AI Escargot'),
+    Puzzle('.......7..6..1...4..34..2..8....3.5...29..7...4..8...9.2..6...7...1..9..7....8.6.', 'AI Killer Application'),
+    Puzzle('1..5..4....9.3.....7...8..5..1....3.8..6..5...9...7..8..4.2..1.2..8..6.......1..2', 'AI Lucky Diamond'),
+    Puzzle('.8......1..7..4.2.6..3..7....2..9...1...6...8.3.4.......17..6...9...8..5.......4.', 'AI Wormhole'),
+    Puzzle('1..4..8...4..3...9..9..6.5..5.3..........16......7...2..4.1.9..7..8....4.2...4.8.', 'AI Labyrinth'),
+    Puzzle('..5..97...6.....2.1..8....6.1.7....4..7.6..3.6....32.......6.4..9..5.1..8..1....2', 'AI Circles'),
+    Puzzle('6.....2...9...1..5..8.3..4......2..15..6..9....7.9.....7...3..2...4..5....6.7..8.', 'AI Squadron'),
+    Puzzle('1......6....1....3..5..29....9..1...7...4..8..3.5....25..4....6..8.6..7..7...5...', 'AI Honeypot'),
+    Puzzle('....1...4.3.2.....6....8.9...7.6...59....5.8....8..4...4.9..1..7....2.4...5.3...7', 'AI Tweezers'),
+    Puzzle('4...6..7.......6...3...2..17....85...1.4......2.95..........7.5..91...3...3.4..8.', 'AI Broken Brick'),
+    Puzzle('12.4..3..3...1..5...6...1..7...9.....4.6.3.....3..2...5...8.7....7.....5.......98', 'Reddit r11.9'),
+]
@@ -0,0 +1,167 @@
+""" Depth first search with an explicit stack instead of recursion """
+from array import array
+from struct import Struct
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Iterator
+from bits import LOWEST, POPCOUNT
+from grid import Grid
+from stats import SolveStats
+
+if TYPE_CHECKING:
+    from main import Sudoku
+
+# magic, deduce, ok, result, stack length, trail length, thinks, deductions, guesses, fails, maxlevel, nodes, elapsed
+_HEADER = Struct('<4s3b8IQ')
+_MAGIC = b'SRCH'
+
+GUESSES = 'abcedfghijk'  # Source of the 1st, 2nd etc value guessed at a point
+NODES = 64  # Guesses or backtracks per run(nodes) for callers that check for something else in between
+
+
+class Search:
+    """ Searches a Sudoku in place, guessing when propagate runs out of known values.\n
+    Each level of the stack is (index, values still to try, trail mark) for the point being guessed.\n
+    The lowest value still to try is the current guess. When it fails the state is undone to the mark,
+    the failure recorded and the best point picked again, which may be a different point.\n
+    run can stop after a number of nodes and be called again to carry on, and the whole search
+    can be saved with dumps and restored with loads.\n
+    donate gives away the untried values of a level for another search to work on.\n
+    The counts and time taken go in stats, which is also where the Sudoku counts its thinks etc """
+
+    def __init__(self, s: 'Sudoku', deduce: bool = True):
+        start = perf_counter_ns()
+        self.s = s
+        self.deduce = deduce
+        self.stack: list[tuple[int, int, int]] = []
+        self.stats = SolveStats()
+        self.nodes = 0  # Guesses and backtracks made
+        self.result: bool | None = None  # None until the search has finished
+        self.donated: set[int] = set()  # Levels whose untried values have been given away
+        s.stats = self.stats
+        self.ok = s.propagate(deduce)  # False means the last guess needs to be backtracked
+        self.stats.elapsed += perf_counter_ns() - start
+
+    def run(self, nodes: int = 0) -> bool | None:
+        """ Search until there is a solution (True) or there can't be one (False).\n
+        nodes=n stops after n guesses or backtracks and returns None, run again to carry on """
+        if self.result is not None:
+            return self.result
+        start = perf_counter_ns()
+        s, stack, deduce, stats = self.s, self.stack, self.deduce, self.stats
+        ok = self.ok
+        count = 0
+        while True:
+            if ok:
+                if (point := s.best()) is None:
+                    # All points have a value
+                    self.result = True
+                    break
+                # Guess the lowest available value of the best point
+                i = point.cell.index
+                remaining = s.grid.available[i]
+                stack.append((i, remaining, s.mark()))
+                if len(stack) > stats.maxlevel:
+                    stats.maxlevel = len(stack)
+                s.place(i, LOWEST[remaining], GUESSES[POPCOUNT[s.grid.failed[i]]])
+                stats.guesses += 1
+                ok = s.propagate(deduce)
+            elif stack:
+                # The guess does not lead to a solution, put back the state and try another on this level
+                i, remaining, mark = stack.pop()
+                s.undo(mark)
+                if len(stack) in self.donated:
+                    # The rest of this level was given away so carry on backtracking
+                    self.donated.discard(len(stack))
+                else:
+                    s.fail(i, LOWEST[remaining])
+                    ok = s.propagate(deduce)
+            else:
+                # Nothing left to try
+                self.result = False
+                break
+            count += 1
+            if count == nodes:
+                break
+        self.ok = ok
+        self.nodes += count
+        stats.elapsed += perf_counter_ns() - start
+        return self.result
+
+    def backtrack(self) -> None:
+        """ Carry on past the solution just found, so the next run looks for another """
+        if self.result:
+            self.result = None
+            self.ok = False
+
+    def solutions(self) -> Iterator[str]:
+        """ Every solution in turn """
+        while self.run():
+            yield self.s.tokenize()
+            self.backtrack()
+
+    def donate(self) -> bytes | None:
+        """ Give away the untried values of the oldest level that has any, as Grid.dumps of the position
+        at that level's mark with the current guess failed. This search will no longer try them.\n
+        None if there is nothing to give away """
+        for level, (i, remaining, mark) in enumerate(self.stack):
+            if level not in self.donated and remaining & (remaining-1):
+                break
+        else:
+            return None
+        # Roll a copy of the grid back to the mark
+        grid = self.s.grid.copy()
+        for j, value, source, failed, available in reversed(self.s.trail[mark:]):
+            grid.values[j], grid.source[j], grid.failed[j], grid.available[j] = value, source, failed, available
+        grid.failed[i] |= remaining & -remaining
+        self.donated.add(level)
+        return grid.dumps()
+
+    @property
+    def level(self) -> int:
+        """ Number of guesses on the current path """
+        return len(self.stack)
+
+    def dumps(self) -> bytes:
+        """ The search as bytes, to be restored with loads. Levels given away by donate are not recorded """
+        s, grid = self.s, self.s.grid
+        trail = array('I', (_ for entry in s.trail for _ in entry))
+        stack = array('I', (_ for entry in self.stack for _ in entry))
+        result = -1 if self.result is None else int(self.result)
+        return b''.join((
+            _HEADER.pack(_MAGIC, self.deduce, self.ok, result, len(self.stack), len(s.trail),
+                         *self.stats.counts, self.nodes, self.stats.elapsed),
+            grid.values, grid.source, grid.failed.tobytes(), stack.tobytes(), trail.tobytes()))
+
+    @classmethod
+    def loads(cls, data: bytes, name: str = '<No Name>') -> 'Search':
+        """ Restore a search saved with dumps """
+        from main import Sudoku
+        (magic, deduce, ok, result, stacklen, traillen,
+         thinks, deductions, guesses, fails, maxlevel, nodes, elapsed) = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a saved Search")
+        pos = _HEADER.size
+        grid = Grid(data[pos:pos+81])
+        grid.source = bytearray(data[pos+81:pos+162])
+        grid.failed = array('H', data[pos+162:pos+324])
+        pos += 324
+        stack = array('I', data[pos:pos+stacklen*12])
+        trail = array('I', data[pos+stacklen*12:pos+stacklen*12+traillen*20])
+
+        # Available values, counts etc are all worked out from the values and failures
+        s = Sudoku.fromgrid(grid, name)
+        # It was saved between steps, so there is nothing to propagate
+        s.singles.clear()
+        s.dirty.clear()
+        s.trail = list(tuple(trail[_:_+5]) for _ in range(0, len(trail), 5))
+        search = cls.__new__(cls)
+        search.s = s
+        search.deduce = bool(deduce)
+        search.stack = list(tuple(stack[_:_+3]) for _ in range(0, len(stack), 3))
+        search.stats = SolveStats(thinks, deductions, guesses, fails, maxlevel, elapsed)
+        search.nodes = nodes
+        search.result = None if result < 0 else bool(result)
+        search.donated = set()
+        search.ok = bool(ok)
+        s.stats = search.stats
+        return search
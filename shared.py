@@ -0,0 +1,109 @@
+""" Batch solving across processes with the results written straight into shared memory.\n
+Each worker writes the 81 solution values and the counts of a puzzle into a fixed size record at the
+puzzle's index, so only (start, count) of each chunk comes back through the pool. The records can then
+be read in place or written out with packed.write_packed """
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from struct import Struct
+from typing import Iterator, Sequence
+from batch import Puzzle, SolveResult, Solver, topuzzle, totext
+from grid import Grid
+from pool import WARMUP, dispatch
+
+# Solution values (all 0 if there is none), solved, thinks, deductions, guesses, fails, maxlevel, elapsed ns
+RECORD = Struct('<81sB5IQ')
+
+_solver: Solver | None = None  # One per worker process
+_memory: shared_memory.SharedMemory | None = None
+
+
+class SharedResults:
+    """ A record per puzzle in shared memory. Index it for the SolveResult of a puzzle.\n
+    puzzles, if given, supply the start position and name of each result """
+
+    def __init__(self, count: int, name: str | None = None, puzzles: Sequence | None = None):
+        self.count = count
+        self.puzzles = puzzles
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=max(1, count*RECORD.size))
+            self.memory.buf[:count*RECORD.size] = bytes(count*RECORD.size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def write(self, index: int, solver: Solver, result: SolveResult) -> None:
+        """ Record the result the solver has just produced """
+        RECORD.pack_into(self.memory.buf, index*RECORD.size, bytes(solver.s.grid.values) if result.solved else b'',
+                         result.solved, result.thinks, result.deductions, result.guesses, result.fails,
+                         result.maxlevel, result.elapsed)
+
+    def values(self, index: int) -> bytes:
+        """ The 81 solution values of a puzzle, all 0 if it has no solution """
+        return bytes(self.memory.buf[index*RECORD.size:index*RECORD.size+81])
+
+    def grids(self) -> Iterator[Grid]:
+        """ A Grid of each solution in order, for packed.write_packed """
+        for index in range(self.count):
+            yield Grid(self.values(index))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> SolveResult:
+        if not -self.count <= index < self.count:
+            raise IndexError(index)
+        index %= self.count
+        values, solved, thinks, deductions, guesses, fails, maxlevel, elapsed = \
+            RECORD.unpack_from(self.memory.buf, index*RECORD.size)
+        startpos, name = topuzzle(self.puzzles[index]) if self.puzzles is not None else ('', '')
+        return SolveResult(index, totext(startpos), Grid(values).tokenize() if solved else None,
+                           thinks, deductions, guesses, fails, maxlevel, elapsed, name)
+
+    def __iter__(self) -> Iterator[SolveResult]:
+        for index in range(self.count):
+            yield self[index]
+
+    def close(self, unlink: bool = True) -> None:
+        """ Release the shared memory, and free it with unlink """
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+    def __enter__(self) -> 'SharedResults':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _warmup(deduce: bool, backend: str, name: str) -> None:
+    global _solver, _memory
+    _solver = Solver(deduce, backend)
+    _solver.solve(WARMUP)
+    _memory = SharedResults(0, name)  # Workers share the parent's resource tracker, which unlinks it once
+
+
+def _solvechunk(start: int, chunk: list[Puzzle]) -> list[tuple[int, int]]:
+    for k, (startpos, name) in enumerate(chunk):
+        _memory.write(start+k, _solver, _solver.solve(startpos, start+k, name))
+    return [(start, len(chunk))]
+
+
+def solve_shared(puzzles: Sequence, workers: int | None = None, chunksize: int = 256, deduce: bool = True,
+                 backend: str = 'search') -> SharedResults:
+    """ Solves the puzzles in worker processes that write the results into shared memory.\n
+    Returns the SharedResults, which should be closed when finished with to free the memory """
+    workers = workers or os.cpu_count() or 1
+    results = SharedResults(len(puzzles), puzzles=puzzles)
+    try:
+        with ProcessPoolExecutor(workers, initializer=_warmup, initargs=(deduce, backend, results.name)) as pool:
+            for _ in dispatch(pool, _solvechunk, puzzles, chunksize, False, 2*workers):
+                pass
+    except BaseException:
+        results.close()
+        raise
+    return results
@@ -0,0 +1,56 @@
+""" Counts and timings of one solve """
+from dataclasses import dataclass, field
+
+# Sudoku methods timed in each phase by Sudoku.profile
+PHASES = {
+    'candidates': ('_used', '_restrict'),
+    'choose': ('best', 'todo'),
+    'deduce': ('_checkunit', 'deduce', 'deduced'),
+    'copy': ('copy', 'undo'),
+    'place': ('place', 'fail', 'clearcache'),
+    'display': ('display',),
+}
+
+
+@dataclass
+class SolveStats:
+    """ What it took to solve one puzzle.\n
+    Each solve gets its own, so nothing carries over from one puzzle to the next """
+    thinks: int = 0  # Points with only 1 available value
+    deductions: int = 0  # Values with only 1 place left in a row, column or 3x3
+    guesses: int = 0
+    fails: int = 0
+    maxlevel: int = 0  # Peak number of guesses on the current path
+    elapsed: int = 0  # ns
+    phases: dict[str, int] = field(default_factory=dict)  # ns in each of PHASES, only when profiling
+
+    @property
+    def seconds(self) -> float:
+        return self.elapsed / 1e9
+
+    @property
+    def total(self) -> int:
+        """ Values placed by any means, including those later undone """
+        return self.thinks + self.deductions + self.guesses
+
+    @property
+    def counts(self) -> tuple[int, int, int, int, int]:
+        """ (thinks, deductions, guesses, fails, maxlevel) """
+        return self.thinks, self.deductions, self.guesses, self.fails, self.maxlevel
+
+    def add(self, other: 'SolveStats', level: int = 0) -> None:
+        """ Include the work of another solve that started level guesses deep, such as a subproblem """
+        self.thinks += other.thinks
+        self.deductions += other.deductions
+        self.guesses += other.guesses
+        self.fails += other.fails
+        self.maxlevel = max(self.maxlevel, level+other.maxlevel)
+        self.elapsed += other.elapsed
+        for phase, ns in other.phases.items():
+            self.phases[phase] = self.phases.get(phase, 0) + ns
+
+    def breakdown(self) -> dict[str, int]:
+        """ ns in each phase, with the rest of elapsed, such as the search itself, as other """
+        ans = {phase: self.phases[phase] for phase in PHASES if phase in self.phases}
+        ans['other'] = max(0, self.elapsed - sum(ns for phase, ns in ans.items() if phase != 'display'))
+        return ans
@@ -0,0 +1,138 @@
+""" Depth first search across processes with work stealing.\n
+Every worker runs its own Search. A worker with nothing to do asks another for work, and that worker
+gives away the untried values of its oldest level with Search.donate, sent as the few hundred bytes of
+Grid.dumps. This keeps every worker busy however unbalanced the search is, so it suits counting or
+listing every solution where the amount of work can't be known up front """
+import multiprocessing
+import os
+from dataclasses import dataclass, field
+from queue import Empty
+from time import perf_counter_ns
+from batch import totext
+from grid import Grid
+from main import Sudoku
+from search import NODES, Search
+
+WAIT = 0.01  # Seconds an idle worker waits for a reply
+CHECK = 1.0  # Seconds between checks that no worker has died while waiting for results
+
+
+@dataclass
+class StealResult:
+    startpos: str
+    count: int = 0  # Solutions found
+    solutions: list = field(default_factory=list[str])  # The first keep found by each worker
+    nodes: list = field(default_factory=list[int])  # Per worker
+    steals: list = field(default_factory=list[int])  # Branches each worker was given, with the whole puzzle for worker 0
+    elapsed: int = 0  # ns
+
+
+def _answer(w: int, search: Search | None, requests, work, busy) -> None:
+    """ Reply to every steal request waiting for worker w """
+    while True:
+        try:
+            thief = requests[w].get_nowait()
+        except Empty:
+            return
+        if search is None or (branch := search.donate()) is None:
+            work[thief].put(None)
+        else:
+            # Count the thief as busy before sending so there is never a moment with work and nobody busy
+            with busy.get_lock():
+                busy.value += 1
+            work[thief].put(branch)
+
+
+def _worker(w: int, requests, work, results, busy, found, stop, limit: int, keep: int, deduce: bool) -> None:
+    workers = len(requests)
+    victim = (w+1) % workers
+    asked = False
+    search = None
+    count = nodes = steals = 0
+    solutions = []
+    while not stop.is_set():
+        if search is None:
+            _answer(w, None, requests, work, busy)
+            try:
+                branch = work[w].get(timeout=WAIT)
+            except Empty:
+                if busy.value == 0:
+                    break  # Nobody has anything left
+                if not asked and workers > 1:
+                    requests[victim].put(w)
+                    asked = True
+                continue
+            asked = False
+            if branch is None:
+                # Refused, try someone else next time
+                victim = (victim+1) % workers
+                if victim == w:
+                    victim = (victim+1) % workers
+                continue
+            search = Search(Sudoku.fromgrid(Grid.loads(branch)), deduce)
+            steals += 1
+        else:
+            result = search.run(NODES)
+            _answer(w, search, requests, work, busy)
+            if result:
+                count += 1
+                if len(solutions) < keep:
+                    solutions.append(search.s.tokenize())
+                with found.get_lock():
+                    found.value += 1
+                    if limit and found.value >= limit:
+                        stop.set()
+                search.backtrack()
+            elif result is False:
+                nodes += search.nodes
+                search = None
+                with busy.get_lock():
+                    busy.value -= 1
+    if search is not None:
+        nodes += search.nodes
+    results.put((w, count, solutions, nodes, steals))
+
+
+def solve_stealing(startpos: str | bytes, workers: int | None = None, limit: int = 0, keep: int = 10,
+                   deduce: bool = True) -> StealResult:
+    """ Counts the solutions of a puzzle across worker processes, stopping at limit if it is not 0.\n
+    Up to keep solutions from each worker are returned along with the nodes searched by each worker and how
+    many branches each was given, to check the load is balanced.\n
+    Raises RuntimeError if a worker dies, after stopping the rest """
+    start = perf_counter_ns()
+    workers = workers or os.cpu_count() or 1
+    context = multiprocessing.get_context()
+    requests = list(context.Queue() for _ in range(workers))
+    work = list(context.Queue() for _ in range(workers))
+    results = context.Queue()
+    busy = context.Value('i', 1)  # The first worker is given the whole puzzle
+    found = context.Value('i', 0)
+    stop = context.Event()
+    work[0].put(Grid.parse(startpos).dumps())
+    processes = list(context.Process(target=_worker, args=(w, requests, work, results, busy, found, stop, limit,
+                                                              keep, deduce), daemon=True) for w in range(workers))
+    for process in processes:
+        process.start()
+    result = StealResult(totext(startpos), nodes=[0]*workers, steals=[0]*workers)
+    received = 0
+    while received < workers:
+        try:
+            w, count, solutions, result.nodes[w], result.steals[w] = results.get(timeout=CHECK)
+        except Empty:
+            # A worker that exits without sending its results leaves the rest waiting for ever
+            if dead := list(p.exitcode for p in processes if p.exitcode not in (None, 0)):
+                stop.set()
+                for process in processes:
+                    process.terminate()
+                    process.join()
+                raise RuntimeError(f"Work stealing worker exited with code {dead[0]}")
+            continue
+        received += 1
+        result.count += count
+        result.solutions.extend(solutions)
+    for process in processes:
+        process.join()
+    if limit:
+        result.count = min(result.count, limit)
+    result.elapsed = perf_counter_ns() - start
+    return result
@@ -0,0 +1,34 @@
+""" Dancing Links against Search """
+from dlx import DancingLinks
+from grid import Grid
+from main import Sudoku, run_dlx
+from puzzles import REFERENCE
+from search import Search
+
+
+def test_same_as_search():
+    for startpos, name in REFERENCE:
+        s = Sudoku(startpos, name)
+        solved, stats = run_dlx(s)
+        assert solved
+        assert s.best() is None
+        search = Search(Sudoku(startpos, name))
+        assert search.run()
+        assert s.tokenize() == search.s.tokenize()
+        assert stats.guesses >= 1
+
+
+def test_sources():
+    s = Sudoku(REFERENCE[1].startpos)
+    run_dlx(s)
+    assert all(a == ' ' if b != '.' else a in '=*abcedfghijk' for a, b in zip(s.tokenize(True), REFERENCE[1].startpos))
+
+
+def test_duplicate_given():
+    for startpos in ('1' + '.'*8 + '1' + '.'*71, '11' + '.'*79, '1' + '.'*19 + '1' + '.'*60):
+        assert DancingLinks(Grid.parse(startpos).values).solve() is None
+        s = Sudoku(startpos)
+        solved, stats = run_dlx(s)
+        assert not solved
+        assert stats.guesses == 0
+        assert s.tokenize() == Grid.parse(startpos).tokenize()
@@ -0,0 +1,76 @@
+""" write_packed and PackedFile """
+import pytest
+from grid import Grid
+from packed import _HEADER, PUZZLES, RECORD, SOLUTIONS, PackedFile, read_packed, write_packed
+from puzzles import REFERENCE
+
+HEADER = _HEADER.size
+SOLUTION = '162857493534129678789643521475312986913586742628794135356478219241935867897261354'
+
+
+def test_roundtrip(tmp_path):
+    path = str(tmp_path / 'reference.sdkp')
+    assert write_packed(path, REFERENCE) == len(REFERENCE)
+    with PackedFile(path) as packed:
+        assert packed.kind == PUZZLES
+        assert len(packed) == len(REFERENCE)
+        for (startpos, name), puzzle in zip(REFERENCE, packed):
+            assert puzzle.startpos.tokenize() == startpos
+            assert puzzle.name == name
+        assert packed[-1].name == REFERENCE[-1].name
+        assert packed.grid(-len(REFERENCE)).tokenize() == REFERENCE[0].startpos
+        assert packed.name(-2) == REFERENCE[-2].name
+        with pytest.raises(IndexError):
+            packed.values(len(REFERENCE))
+        with pytest.raises(IndexError):
+            packed[-len(REFERENCE)-1]
+
+
+def test_without_names(tmp_path):
+    path = str(tmp_path / 'solutions.sdkp')
+    write_packed(path, [SOLUTION, Grid.parse(SOLUTION), SOLUTION.encode()], SOLUTIONS)
+    puzzles = list(read_packed(path))
+    assert list(_.startpos.tokenize() for _ in puzzles) == [SOLUTION] * 3
+    assert list(_.name for _ in puzzles) == [''] * 3
+
+
+def test_not_packed(tmp_path):
+    path = tmp_path / 'puzzles.txt'
+    path.write_text(REFERENCE[0].startpos * 2)
+    with pytest.raises(ValueError):
+        PackedFile(str(path))
+
+
+def test_cut_off(tmp_path):
+    path = str(tmp_path / 'reference.sdkp')
+    write_packed(path, REFERENCE)
+    data = open(path, 'rb').read()
+    records = HEADER + RECORD*len(REFERENCE)
+    # Inside the records, inside the name offsets and inside the names
+    for size in (HEADER + 5*RECORD, records + 8, len(data) - 1):
+        with open(path, 'wb') as f:
+            f.write(data[:size])
+        with pytest.raises(ValueError):
+            PackedFile(path)
+
+
+def test_other_record_size(tmp_path):
+    path = tmp_path / 'wide.sdkp'
+    write_packed(str(path), REFERENCE[:1])
+    data = bytearray(path.read_bytes())
+    data[6] = 81  # Record size, after magic, version and kind
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        PackedFile(str(path))
+
+
+def test_failed_write_leaves_nothing(tmp_path):
+    path = tmp_path / 'bad.sdkp'
+    with pytest.raises(AttributeError):
+        write_packed(str(path), [REFERENCE[0], (REFERENCE[1].startpos, None)])
+    assert list(tmp_path.iterdir()) == []
+    write_packed(str(path), REFERENCE[:1])
+    with pytest.raises(AttributeError):
+        write_packed(str(path), [(REFERENCE[1].startpos, None)])
+    with PackedFile(str(path)) as packed:
+        assert packed[0].name == REFERENCE[0].name
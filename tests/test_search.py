@@ -0,0 +1,43 @@
+""" Search, including pausing, saving and resuming """
+from main import Sudoku
+from puzzles import REFERENCE
+from search import Search
+
+R119 = next(p for p in REFERENCE if p.name == 'Reddit r11.9')
+SEVERAL = '1....7....3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..'
+
+
+def test_solves_reference():
+    for startpos, name in REFERENCE:
+        search = Search(Sudoku(startpos, name))
+        assert search.run()
+        assert search.s.best() is None
+        assert all(a == b for a, b in zip(startpos, search.s.tokenize()) if a != '.')
+
+
+def test_resume_matches_unpaused():
+    whole = Search(Sudoku(R119.startpos))
+    assert whole.run()
+    for nodes in (1, 50, 200):
+        paused = Search(Sudoku(R119.startpos))
+        assert paused.run(nodes) is None
+        resumed = Search.loads(paused.dumps())
+        assert resumed.run()
+        assert resumed.s.tokenize() == whole.s.tokenize()
+        assert resumed.stats.counts == whole.stats.counts
+        assert resumed.nodes == whole.nodes
+
+
+def test_solutions():
+    # AI Escargot without the 9 in its first row has 20 solutions
+    search = Search(Sudoku(SEVERAL))
+    solutions = list(search.solutions())
+    assert len(solutions) == len(set(solutions)) == 20
+    assert all(Search(Sudoku(_)).run() for _ in solutions)
+
+
+def test_duplicate_given():
+    for startpos in ('1' + '.'*8 + '1' + '.'*71, '11' + '.'*79, '1' + '.'*19 + '1' + '.'*60):
+        search = Search(Sudoku(startpos))
+        assert search.run() is False
+        assert search.stats.guesses == 0
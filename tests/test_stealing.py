@@ -0,0 +1,23 @@
+""" Counting solutions with work stealing against a single Search """
+from main import Sudoku
+from search import Search
+from stealing import solve_stealing
+from test_search import SEVERAL
+
+
+def test_count_matches_search():
+    expected = set(Search(Sudoku(SEVERAL)).solutions())
+    result = solve_stealing(SEVERAL, workers=3, keep=len(expected))
+    assert result.count == len(expected)
+    assert set(result.solutions) == expected
+    # Worker 0's start counts as 1, so more means a branch really was stolen
+    assert sum(result.steals) > 1
+    assert sum(nodes > 0 for nodes in result.nodes) > 1
+
+
+def test_limit():
+    assert solve_stealing(SEVERAL, workers=2, limit=5).count == 5
+
+
+def test_no_solution():
+    assert solve_stealing('11' + '.'*79, workers=2).count == 0
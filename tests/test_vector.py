@@ -0,0 +1,79 @@
+""" propagate_batch and solve_vector against Search """
+import random
+import pytest
+from batch import solve_many
+from geometry import UNITS
+from main import Sudoku
+from puzzles import REFERENCE
+from search import Search
+
+np = pytest.importorskip('numpy')
+from vector import propagate_batch, solve_vector  # noqa: E402
+
+
+def _solution(startpos: str) -> str | None:
+    search = Search(Sudoku(startpos))
+    return search.s.tokenize() if search.run() else None
+
+
+def _puzzles(count: int, seed: int = 1) -> list[str]:
+    """ Solutions of the reference puzzles with random points cleared, some with a given changed or duplicated """
+    rnd = random.Random(seed)
+    solutions = list(_solution(p.startpos) for p in REFERENCE)
+    ans = []
+    for k in range(count):
+        points = list(rnd.choice(solutions))
+        for i in rnd.sample(range(81), rnd.randrange(20, 60)):
+            points[i] = '.'
+        if k % 3 == 1:
+            # Change a given, which usually leaves no solution
+            i = rnd.choice(list(i for i in range(81) if points[i] != '.'))
+            points[i] = str(int(points[i]) % 9 + 1)
+        elif k % 3 == 2:
+            # The same value twice in a unit
+            cells = rnd.choice(UNITS)
+            points[cells[1]] = points[cells[0]] = str(rnd.randrange(1, 10))
+        ans.append(''.join(points))
+    return ans
+
+
+@pytest.mark.parametrize('deduce', [True, False])
+def test_propagate_batch_matches_search(deduce):
+    puzzles = _puzzles(300)
+    values = np.frombuffer(b''.join(Sudoku(p).grid.values for p in puzzles), dtype=np.uint8).reshape(-1, 81)
+    after, solved, broken, thinks, deductions = propagate_batch(values.copy(), deduce)
+    assert not (solved & broken).any()
+    if not deduce:
+        assert not deductions.any()
+    kinds = set()
+    for k, startpos in enumerate(puzzles):
+        expected = _solution(startpos)
+        given = values[k] != 0
+        assert (after[k][given] == values[k][given]).all()
+        if broken[k]:
+            kinds.add('broken')
+            assert expected is None
+        elif solved[k]:
+            kinds.add('solved')
+            assert ''.join(map(str, after[k])) == expected
+        else:
+            kinds.add('stalled')
+            assert not after[k].all()
+            if expected is not None:
+                # Whatever was placed agrees with the solution
+                placed = after[k] != 0
+                assert (np.frombuffer(expected.encode(), dtype=np.uint8)[placed] - 48 == after[k][placed]).all()
+    assert kinds == {'broken', 'solved', 'stalled'}
+
+
+@pytest.mark.parametrize('deduce', [True, False])
+def test_solve_vector_matches_solve_many(deduce):
+    puzzles = _puzzles(60, seed=2) + list(REFERENCE)
+    for a, b in zip(solve_vector(puzzles, batchsize=16, deduce=deduce), solve_many(puzzles, deduce=deduce)):
+        assert a.index == b.index
+        assert a.startpos == b.startpos
+        assert a.solved == b.solved
+        if a.solved:
+            # Puzzles with points cleared can have more than one solution, so check it is one
+            assert all(x == y for x, y in zip(a.startpos, a.solution) if x != '.')
+            assert all(len(set(a.solution[i] for i in cells)) == 9 for cells in UNITS)
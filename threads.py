@@ -0,0 +1,66 @@
+""" Solving a stream of puzzles across threads.\n
+The solver keeps no shared mutable state: each thread has its own Solver, and Search and DancingLinks
+count into themselves. On a free threaded (no GIL) Python the threads run in parallel without the
+process start up and pickling of pool.solve_pool. With the GIL they take turns.\n
+python threads.py [file] compares the two """
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Iterable, Iterator
+from batch import Puzzle, SolveResult, Solver
+from grid import Grid
+from pool import WARMUP, dispatch, solve_pool
+
+_local = threading.local()  # Each thread's Solver
+
+
+def _init(deduce: bool, backend: str) -> None:
+    _local.solver = Solver(deduce, backend)
+    _local.solver.solve(WARMUP)
+
+
+def _solvechunk(start: int, chunk: list[Puzzle]) -> list[SolveResult]:
+    solver = _local.solver
+    return list(solver.solve(startpos, start+k, name) for k, (startpos, name) in enumerate(chunk))
+
+
+def solve_threads(puzzles: Iterable[str | bytes | Grid | tuple], workers: int | None = None, chunksize: int = 256,
+                  ordered: bool = True, deduce: bool = True, backend: str = 'search') -> Iterator[SolveResult]:
+    """ Solves the puzzles in a thread pool, yielding a SolveResult for each.\n
+    ordered=True yields in input order, otherwise as each chunk completes """
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(workers, initializer=_init, initargs=(deduce, backend)) as pool:
+        yield from dispatch(pool, _solvechunk, puzzles, chunksize, ordered, 2*workers)
+
+
+def gil() -> bool:
+    """ True unless this is a free threaded Python running without the GIL """
+    return getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+def benchmark(puzzles: list, workers: int | None = None, chunksize: int = 64) -> dict[str, float]:
+    """ Seconds taken by solve_threads and solve_pool for the same puzzles """
+    ans = {}
+    for name, method in (('threads', solve_threads), ('processes', solve_pool)):
+        start = perf_counter()
+        for _ in method(puzzles, workers, chunksize):
+            pass
+        ans[name] = perf_counter() - start
+    return ans
+
+
+if __name__ == '__main__':
+    import argparse
+    from dataset import read_puzzles
+    parser = argparse.ArgumentParser(description="Compare solving in threads with solving in processes")
+    parser.add_argument('file', nargs='?', help="Puzzle file, one per line. AI Escargot repeated if not given")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--count', type=int, default=500, help="Times to repeat AI Escargot")
+    args = parser.parse_args()
+    puzzles = list(read_puzzles(args.file)) if args.file else [WARMUP] * args.count
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil() else 'disabled'}, "
+          f"{args.workers or os.cpu_count()} workers, {len(puzzles)} puzzles")
+    for name, seconds in benchmark(puzzles, args.workers).items():
+        print(f"{name:10} {seconds:8.3f}s {len(puzzles)/seconds:10.1f} puzzles/s")
@@ -0,0 +1,108 @@
+""" Propagation of thousands of puzzles at once with NumPy.\n
+Naked and hidden singles are found for a whole batch with array operations. Only the puzzles
+that stall are passed on to a Solver one at a time.\n
+numpy is only needed for this module """
+from itertools import islice
+from time import perf_counter_ns
+from typing import Iterable, Iterator
+from batch import SolveResult, Solver, topuzzle, totext
+from geometry import CELL_UNITS, UNITS
+from grid import Grid
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    _UNITS = np.array(UNITS)  # (27, 9) cells of each unit
+    _CELL_UNITS = np.array(CELL_UNITS)  # (81, 3) units of each cell
+    _DIGITS = np.arange(1, 10, dtype=np.uint8)
+    _TOKENS = np.frombuffer(b'.123456789', dtype=np.uint8)
+
+
+def _neednumpy() -> None:
+    if np is None:
+        raise ImportError("vector needs numpy, pip install numpy")
+
+
+def _values(startpos: str | bytes | Grid) -> bytes | bytearray:
+    return startpos.values if isinstance(startpos, Grid) else Grid.parse(startpos).values
+
+
+def propagate_batch(values: 'np.ndarray', deduce: bool = True) -> tuple['np.ndarray', ...]:
+    """ Place every naked single, and with deduce every hidden single, in an (N, 81) uint8 array of values.\n
+    Returns (values, solved, broken, thinks, deductions) where solved and broken are (N,) bools,
+    broken meaning the puzzle has no solution, and thinks and deductions are (N,) counts """
+    _neednumpy()
+    values = np.array(values, dtype=np.uint8)
+    n = len(values)
+    thinks = np.zeros(n, dtype=np.int64)
+    deductions = np.zeros(n, dtype=np.int64)
+    broken = np.zeros(n, dtype=bool)
+    active = np.arange(n)  # Puzzles that changed last time round
+    while active.size:
+        v = values[active]
+        empty = v == 0
+        # How many times each value is placed in each unit, (n, 27, 9)
+        placedcount = (v[:, :, None] == _DIGITS)[:, _UNITS, :].sum(axis=2)
+        placed = placedcount > 0
+        # Candidates of each point, (n, 81, 9)
+        cand = ~placed[:, _CELL_UNITS, :].any(axis=2) & empty[:, :, None]
+        ncand = cand.sum(axis=2)
+        # Places left for each value in each unit, (n, 27, 9)
+        unitcand = cand[:, _UNITS, :]
+        unitcount = unitcand.sum(axis=2)
+        dead = ((placedcount > 1).any(axis=(1, 2)) | (empty & (ncand == 0)).any(axis=1)
+                | ((unitcount == 0) & ~placed).any(axis=(1, 2)))
+
+        # Naked singles
+        naked = empty & (ncand == 1)
+        new = np.where(naked, cand.argmax(axis=2) + 1, 0).astype(np.uint8)
+        thinks[active] += np.where(dead, 0, naked.sum(axis=1))
+        if deduce:
+            # Hidden singles, point by point where not already a naked single
+            hidden = unitcand & ((unitcount == 1) & ~placed)[:, :, None, :]
+            p, unit, k, d = np.nonzero(hidden)
+            cells = _UNITS[unit, k]
+            fresh = new[p, cells] == 0
+            new[p[fresh], cells[fresh]] = d[fresh] + 1
+            deductions[active] += np.where(dead, 0, ((new != 0) & ~naked).sum(axis=1))
+
+        # A contradiction ends the puzzle, anything with no new values has stalled
+        broken[active[dead]] = True
+        changed = (new != 0).any(axis=1) & ~dead
+        values[active[changed]] = np.where(new[changed] != 0, new[changed], v[changed])
+        active = active[changed]
+    solved = (values != 0).all(axis=1) & ~broken
+    return values, solved, broken, thinks, deductions
+
+
+def solve_vector(puzzles: Iterable[str | bytes | Grid | tuple], batchsize: int = 4096, deduce: bool = True,
+                 backend: str = 'search') -> Iterator[SolveResult]:
+    """ Solves the puzzles batchsize at a time, yielding a SolveResult for each in input order.\n
+    The batch time for propagate_batch is shared equally between its puzzles in elapsed.\n
+    Puzzles that stall are finished by a Solver from the values propagate_batch reached """
+    _neednumpy()
+    solver = Solver(deduce, backend)
+    puzzles = iter(puzzles)
+    index = 0
+    while batch := list(topuzzle(p) for p in islice(puzzles, batchsize)):
+        start = perf_counter_ns()
+        values = np.frombuffer(b''.join(_values(p.startpos) for p in batch), dtype=np.uint8).reshape(-1, 81)
+        values, solved, broken, thinks, deductions = propagate_batch(values, deduce)
+        tokens = _TOKENS[values]
+        each = (perf_counter_ns() - start) // len(batch)
+        for k, (startpos, name) in enumerate(batch):
+            startpos = totext(startpos)
+            if solved[k] or broken[k]:
+                result = SolveResult(index+k, startpos, tokens[k].tobytes().decode('ascii') if solved[k] else None,
+                                     name=name)
+            else:
+                result = solver.solve(tokens[k].tobytes(), index+k, name)
+                result.startpos = startpos
+            result.thinks += int(thinks[k])
+            result.deductions += int(deductions[k])
+            result.elapsed += each
+            yield result
+        index += len(batch)